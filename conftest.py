@@ -0,0 +1,97 @@
+"""Shared pytest configuration.
+
+Tests that exercise the translation backend run against a deterministic
+in-process fake by default. Pass ``--run-integration`` to hit the live
+Hugging Face Inference API instead; tests marked ``integration`` only run
+in that mode.
+"""
+import os
+
+import pytest
+
+from src import translator
+from tests import _translate_cache
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--run-integration",
+        action="store_true",
+        default=False,
+        help="Run tests against the live Hugging Face translation backend",
+    )
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers",
+        "integration: requires the live translation backend (enable with --run-integration)",
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--run-integration"):
+        return
+
+    skip_live = pytest.mark.skip(reason="live backend test (use --run-integration)")
+    for item in items:
+        if "integration" in item.keywords:
+            item.add_marker(skip_live)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def hf_api_token():
+    """Load .env once per session and return the configured HF token."""
+    try:
+        from dotenv import load_dotenv
+        load_dotenv()
+    except ImportError:
+        pass
+    return os.environ.get("HF_API_TOKEN")
+
+
+@pytest.fixture(scope="session")
+def hf_model_ready(hf_api_token):
+    """Probe the live DE→EN backend once per session."""
+    return translator.has_model("de", "en")
+
+
+class FakeHfClient:
+    """Deterministic stand-in for HfClient that never touches the network."""
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def translate_texts(self, texts, src, dst):
+        return [f"[{dst}] {text}" for text in texts]
+
+    def health_check(self, src="de", dst="en"):
+        return True
+
+
+@pytest.fixture
+def fake_hf_backend(request, monkeypatch):
+    """Serve translations from FakeHfClient unless --run-integration is set.
+
+    In live mode the test is skipped when the backend is unreachable.
+    Fake translations are dropped from the integration memo on both sides of
+    the test so they are never served to a live-backend test.
+    """
+    if request.config.getoption("--run-integration"):
+        if not request.getfixturevalue("hf_model_ready"):
+            pytest.skip("HF translation backend unavailable")
+        yield
+        return
+
+    monkeypatch.setenv("TRANSLATOR_BACKEND", "hf")
+    monkeypatch.setattr(translator, "HfClient", FakeHfClient)
+    monkeypatch.setattr(translator, "_default_context", translator.TranslationContext())
+    _translate_cache.clear()
+    yield
+    _translate_cache.clear()
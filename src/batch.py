@@ -1,40 +1,77 @@
 #!/usr/bin/env python3
 """Batch processing for sitemap-based translations"""
+import io
 import json
 import logging
+import os
+import re
 import time
 import threading
 from collections import deque
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Optional
+from typing import IO, Any, Iterable, Iterator, Optional, Union
 from urllib.parse import urlparse
 
 from lxml import etree
 
+try:  # Optional: stream large JSON sitemaps instead of loading them whole
+    import ijson
+except ImportError:  # pragma: no cover - exercised without ijson installed
+    ijson = None
+
+try:  # Optional: C JSON decoder for the non-streaming fallback
+    import orjson
+except ImportError:  # pragma: no cover - exercised without orjson installed
+    orjson = None
+
+from src.cache import PageHashCache
 from src.fetcher import fetch, FetchError
 from src.parser import parse
 from src.pipeline import extract_texts
 from src.translator import preview_batch, translate_batch
 from src.writer import (
     apply_translations, rewrite_links,
-    set_lang, map_paths, save_html
+    set_lang, map_paths, save_html, output_tree_has_symlinks
 )
 
 logger = logging.getLogger(__name__)
 
 SITEMAP_NAMESPACE = {'sm': 'http://www.sitemaps.org/schemas/sitemap/0.9'}
 
+_LOC_TAG = f"{{{SITEMAP_NAMESPACE['sm']}}}loc"
+
+# Host is exactly www.landsiedel.com and the path contains a /de/ segment
+_DE_URL_RE = re.compile(r'^(?:[A-Za-z][A-Za-z0-9+.-]*:)?//www\.landsiedel\.com/(?:[^?#]*/)?de/')
+
+# Hardened parser flags shared by every sitemap parse (no XXE, no network)
+_SITEMAP_PARSER_OPTIONS = {
+    'resolve_entities': False,  # Disable external entity resolution
+    'no_network': True,         # Block network access
+    'dtd_validation': False,    # Disable DTD validation
+    'load_dtd': False,          # Do not load DTDs
+    'huge_tree': False,         # Keep libxml2's size limits in place
+}
+
 
 class RateLimiter:
-    """Token bucket rate limiter for concurrent requests."""
+    """
+    Token bucket rate limiter for concurrent requests.
+
+    Allows at most ``max_requests`` per ``time_window`` and, when
+    ``min_interval`` is set, spaces consecutive request starts at least that
+    many seconds apart across all threads.
+    """
 
-    def __init__(self, max_requests: int = 5, time_window: float = 1.0):
+    def __init__(self, max_requests: int = 5, time_window: float = 1.0,
+                 min_interval: float = 0.0):
         self.max_requests = max_requests
         self.time_window = time_window
+        self.min_interval = min_interval
         self.requests: deque = deque()
         self.lock = threading.Lock()
+        self._next_allowed = 0.0
 
     def wait_if_needed(self):
         """Block if rate limit exceeded."""
@@ -53,81 +90,144 @@ class RateLimiter:
 
             self.requests.append(time.time())
 
+            # Reserve the next start slot; the spacing wait happens unlocked
+            mono_now = time.monotonic()
+            slot = max(mono_now, self._next_allowed)
+            self._next_allowed = slot + self.min_interval
 
-def load_sitemap_json(path: str) -> list[str]:
+        if slot > mono_now:
+            time.sleep(slot - mono_now)
+
+
+# Sitemap loaders accept a filesystem path, an already-open file object,
+# or the raw document bytes
+SitemapSource = Union[str, os.PathLike, IO, bytes, bytearray]
+
+
+def _filter_sitemap_urls(urls: Iterable[Optional[str]]) -> list[str]:
     """
-    Load URLs from sitemap.json.
-    
-    Expects: Array of objects with 'url' or 'loc' field.
+    Deduplicate and filter sitemap URLs in a single pass.
+
+    Each distinct URL is matched once; repeats are dropped via a seen-set.
     Filters: Only /de/ URLs from www.landsiedel.com
-    Returns: Deduplicated list of URLs
+    Returns: Sorted list of unique matching URLs
     """
-    with open(path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    
-    if not isinstance(data, list):
-        raise ValueError("sitemap.json must contain an array")
-    
-    urls = set()
-    for item in data:
-        if not isinstance(item, dict):
-            continue
-        url = item.get('url') or item.get('loc')
-        if url:
-            urls.add(url)
-    
-    # Filter: only /de/ URLs from www.landsiedel.com
+    seen = set()
     filtered = []
+    is_de_url = _DE_URL_RE.match  # Bound once; called for every distinct URL
     for url in urls:
-        parsed = urlparse(url)
-        if parsed.netloc == 'www.landsiedel.com' and '/de/' in parsed.path:
+        if not url or url in seen:
+            continue
+        seen.add(url)
+        if is_de_url(url):
             filtered.append(url)
-    
+
     return sorted(filtered)
 
 
-def load_sitemap_xml(path: str) -> list[str]:
+def load_sitemap_json(source: SitemapSource) -> list[str]:
+    """
+    Load URLs from sitemap.json.
+    
+    Accepts: File path, an open (text/binary) file-like object, or bytes.
+    Expects: Array of objects with 'url' or 'loc' field.
+    Filters: Only /de/ URLs from www.landsiedel.com
+    Returns: Deduplicated list of URLs
+    """
+    if isinstance(source, (bytes, bytearray)):
+        source = io.BytesIO(source)
+    if hasattr(source, 'read'):
+        return _collect_json_urls(source)
+    with open(source, 'rb') as f:
+        return _collect_json_urls(f)
+
+
+def _iter_json_entries(fh: IO) -> Iterator[Any]:
+    """
+    Yield top-level array entries of a JSON sitemap.
+
+    Streams binary input with ijson when installed so large sitemaps are
+    never fully materialized; text streams and missing ijson load the whole
+    document (with orjson when available).
+    Raises: ValueError if the document is not a JSON array or is malformed
+    """
+    if ijson is None or isinstance(fh, io.TextIOBase):
+        data = orjson.loads(fh.read()) if orjson is not None else json.load(fh)
+        if not isinstance(data, list):
+            raise ValueError("sitemap.json must contain an array")
+        yield from data
+        return
+
+    try:
+        events = ijson.parse(fh)
+        _, event, _ = next(events)
+        if event != 'start_array':
+            raise ValueError("sitemap.json must contain an array")
+        yield from ijson.items(events, 'item')
+    except ijson.JSONError as e:
+        raise ValueError(f"Invalid sitemap JSON: {e}") from e
+
+
+def _collect_json_urls(fh: IO) -> list[str]:
+    """Extract, filter and deduplicate URLs from an open JSON sitemap."""
+    urls = (
+        item.get('url') or item.get('loc')
+        for item in _iter_json_entries(fh)
+        if isinstance(item, dict)
+    )
+    return _filter_sitemap_urls(urls)
+
+
+def load_sitemap_xml(source: SitemapSource) -> list[str]:
     """
     Load URLs from sitemap.xml.
 
+    Accepts: File path, an open binary file-like object, or bytes.
     Handles standard sitemap.org schema with namespaces.
     Filters: Only /de/ URLs from www.landsiedel.com
     Returns: Deduplicated list of URLs
     Raises: etree.XMLSyntaxError if XML is malformed or contains unsafe entities
     """
-    # Create secure parser to prevent XXE attacks
-    parser = etree.XMLParser(
-        resolve_entities=False,  # Disable external entity resolution
-        no_network=True,         # Block network access
-        dtd_validation=False,    # Disable DTD validation
-        load_dtd=False           # Do not load DTDs
+    if isinstance(source, (bytes, bytearray)):
+        source = io.BytesIO(source)
+
+    # Stream <loc> elements with the shared hardened parser flags
+    context = etree.iterparse(
+        source if hasattr(source, 'read') else str(source),
+        events=('end',),
+        tag=(_LOC_TAG, 'loc'),
+        **_SITEMAP_PARSER_OPTIONS,
     )
 
+    # Filter and dedupe while streaming so only in-scope URLs are retained
+    namespaced: set[str] = set()
+    plain: set[str] = set()
+    has_namespaced = False
+    is_de_url = _DE_URL_RE.match
     try:
-        tree = etree.parse(path, parser)
-        root = tree.getroot()
+        for _, elem in context:
+            url = elem.text
+            if url is not None:
+                is_namespaced = elem.tag == _LOC_TAG
+                has_namespaced = has_namespaced or is_namespaced
+                if is_de_url(url):
+                    (namespaced if is_namespaced else plain).add(url)
+            elem.clear()
+            # Drop already-processed <url> siblings so memory stays flat
+            parent = elem.getparent()
+            grandparent = parent.getparent() if parent is not None else None
+            # <loc> directly under the root: the root's siblings are
+            # prolog comments/PIs, which cannot be deleted
+            if grandparent is not None:
+                while parent.getprevious() is not None:
+                    del grandparent[0]
     except etree.XMLSyntaxError as e:
-        logger.error(f"XML parsing failed for {path}: {e}")
+        label = source if not hasattr(source, 'read') else getattr(source, 'name', '<stream>')
+        logger.error(f"XML parsing failed for {label}: {e}")
         raise
-    
-    # Extract URLs (namespace-safe)
-    urls = set()
-    for loc in root.xpath('//sm:loc/text()', namespaces=SITEMAP_NAMESPACE):
-        urls.add(loc)
-    
-    # Fallback: try without namespace
-    if not urls:
-        for loc in root.xpath('//loc/text()'):
-            urls.add(loc)
-    
-    # Filter: only /de/ URLs from www.landsiedel.com
-    filtered = []
-    for url in urls:
-        parsed = urlparse(url)
-        if parsed.netloc == 'www.landsiedel.com' and '/de/' in parsed.path:
-            filtered.append(url)
-    
-    return sorted(filtered)
+
+    # Namespace-safe first, falling back to un-namespaced <loc>
+    return sorted(namespaced if has_namespaced else plain)
 
 
 def load_sitemap(path: str) -> list[str]:
@@ -165,7 +265,13 @@ def load_sitemap(path: str) -> list[str]:
     raise ValueError(f"Could not parse {path} as JSON or XML sitemap")
 
 
-def process_single_url(url: str, output_dir: str, dry_run: bool = False) -> Optional[dict]:
+def process_single_url(
+    url: str,
+    output_dir: str,
+    dry_run: bool = False,
+    page_cache: Optional[PageHashCache] = None,
+    trusted_output: bool = False
+) -> Optional[dict]:
     """
     Process single URL through the translation pipeline.
 
@@ -181,11 +287,31 @@ def process_single_url(url: str, output_dir: str, dry_run: bool = False) -> Opti
     When ``dry_run`` is True, the function returns a summary dictionary and
     stops before translation and write steps.
 
+    When ``page_cache`` is given and the fetched HTML hashes to the value
+    recorded on a previous run (with both outputs still on disk), the page
+    is left untouched and ``{'url': url, 'unchanged': True}`` is returned.
+
+    ``trusted_output`` is forwarded to map_paths (see there).
+
     Raises: FetchError for HTTP issues, Exception for other errors
     """
     # Fetch
     html, meta = fetch(url)
-    
+
+    content_hash = None
+    if page_cache is not None and not dry_run:
+        content_hash = PageHashCache.hash_content(html)
+        de_path, en_path = map_paths(
+            meta['final_url'], output_dir, trusted_output=trusted_output
+        )
+        if (
+            page_cache.get(url) == content_hash
+            and Path(de_path).exists()
+            and Path(en_path).exists()
+        ):
+            logger.info(f"  Unchanged since last run: {url}")
+            return {'url': url, 'unchanged': True}
+
     # Parse
     soup, items = parse(html)
 
@@ -229,7 +355,9 @@ def process_single_url(url: str, output_dir: str, dry_run: bool = False) -> Opti
     set_lang(soup, lang='en')
     
     # Map output paths
-    de_path, en_path = map_paths(meta['final_url'], output_dir)
+    de_path, en_path = map_paths(
+        meta['final_url'], output_dir, trusted_output=trusted_output
+    )
 
     # Save original DE version (raw HTML, no re-parsing needed)
     Path(de_path).parent.mkdir(parents=True, exist_ok=True)
@@ -241,6 +369,9 @@ def process_single_url(url: str, output_dir: str, dry_run: bool = False) -> Opti
     logger.info(f"  Saved: {de_path}")
     logger.info(f"  Saved: {en_path}")
 
+    if page_cache is not None:
+        page_cache.set(url, content_hash, en_path)
+
     return None
 
 
@@ -250,7 +381,8 @@ def run_batch(
     delay: float = 0.2,
     log_file: Optional[str] = None,
     dry_run: bool = False,
-    max_workers: int = 5
+    max_workers: int = 5,
+    page_cache_path: Optional[str] = None
 ) -> dict[str, Any]:
     """
     Process multiple URLs from a sitemap with error handling and rate limiting.
@@ -258,10 +390,12 @@ def run_batch(
     Args:
         urls: List of URLs to process
         output_dir: Output directory for HTML files
-        delay: Delay in seconds between requests (default 0.2, deprecated in favor of rate limiter)
+        delay: Minimum spacing in seconds between request starts (default 0.2)
         log_file: Optional log file path
         dry_run: When True, plan translations without calling the backend
         max_workers: Maximum number of concurrent workers (default 5)
+        page_cache_path: Optional SQLite file of page hashes; pages whose HTML
+            is unchanged since the last run are counted as skipped
 
     Returns:
         {
@@ -295,15 +429,25 @@ def run_batch(
     logger.info(f"Starting batch processing: {total} URLs (dry-run={dry_run}, workers={max_workers})")
 
     # Create rate limiter for concurrent requests
-    rate_limiter = RateLimiter(max_requests=max_workers, time_window=1.0)
+    rate_limiter = RateLimiter(
+        max_requests=max_workers, time_window=1.0, min_interval=delay
+    )
     completed_count = 0
     lock = threading.Lock()
+    page_cache = PageHashCache(page_cache_path) if page_cache_path else None
+    # We never create symlinks, so one scan up front lets every page skip
+    # realpath() when writing. The check runs once per run: a symlink
+    # planted in output_dir while the batch is running is not detected.
+    trusted_output = not output_tree_has_symlinks(output_dir)
 
     def process_with_rate_limit(url: str) -> tuple[str, Optional[dict], Optional[Exception], str]:
         """Process URL with rate limiting. Returns (url, summary, error, error_type)."""
         rate_limiter.wait_if_needed()
         try:
-            summary = process_single_url(url, output_dir, dry_run=dry_run)
+            summary = process_single_url(
+                url, output_dir, dry_run=dry_run, page_cache=page_cache,
+                trusted_output=trusted_output
+            )
             return (url, summary, None, '')
         except FetchError as exc:
             return (url, None, exc, 'fetch')
@@ -320,7 +464,11 @@ def run_batch(
             with lock:
                 completed_count += 1
 
-                if error is None:
+                if error is None and isinstance(summary, dict) and summary.get('unchanged'):
+                    skipped += 1
+                    logger.info(f"[{completed_count}/{total}] Skipped (unchanged): {url}")
+
+                elif error is None:
                     success += 1
                     logger.info(f"[{completed_count}/{total}] Success: {url}")
 
@@ -340,12 +488,15 @@ def run_batch(
                     failed_urls.append((url, error_msg))
                     logger.error(f"[{completed_count}/{total}] Failed: {url} - {error}", exc_info=error)
 
+    if page_cache is not None:
+        page_cache.close()
+
     if failed_urls:
         failed_path = Path(output_dir) / 'failed_urls.txt'
-        with open(failed_path, 'w', encoding='utf-8') as fh:
-            fh.write(f"# Failed URLs ({datetime.now().strftime('%Y-%m-%d %H:%M:%S')})\n")
-            for entry_url, error in failed_urls:
-                fh.write(f"{entry_url} | Error: {error}\n")
+        lines = [f"# Failed URLs ({datetime.now().strftime('%Y-%m-%d %H:%M:%S')})\n"]
+        lines.extend(f"{entry_url} | Error: {error}\n" for entry_url, error in failed_urls)
+        # One write call for the whole report
+        failed_path.write_text(''.join(lines), encoding='utf-8')
         logger.info(f"Failed URLs written to: {failed_path}")
 
     logger.info("=" * 60)
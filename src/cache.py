@@ -1,16 +1,21 @@
-"""Persistent SQLite cache for translations.
+"""Persistent SQLite caches for translations and fetched pages.
 
 Caches translations to avoid redundant API calls.
 Cache key is based on text content, languages, and model.
+Page hashes let batch re-runs skip pages whose HTML has not changed.
 """
 import hashlib
 import logging
 import sqlite3
+import threading
 from pathlib import Path
 from typing import Optional
 
 logger = logging.getLogger(__name__)
 
+# Keys per SELECT ... IN (...); stays below SQLITE_MAX_VARIABLE_NUMBER (999 on older builds)
+_GET_MANY_CHUNK = 500
+
 
 class TranslationCache:
     """SQLite-backed translation cache.
@@ -46,6 +51,9 @@ class TranslationCache:
                 timeout=5.0  # Prevent indefinite hangs
             )
             self._conn.execute("PRAGMA busy_timeout = 5000")
+            # WAL lets readers proceed during writes; NORMAL skips per-commit fsync of the WAL
+            self._conn.execute("PRAGMA journal_mode = WAL")
+            self._conn.execute("PRAGMA synchronous = NORMAL")
         return self._conn
 
     def close(self):
@@ -126,19 +134,18 @@ class TranslationCache:
         key_map = {text: self._make_key(text, src, dst, model) for text in texts}
         cache_keys = list(key_map.values())
 
-        # Query database
+        # Query database in chunks to respect SQLite's bound-parameter limit
         results = {}
-        # Use parameterized query with placeholders
-        placeholders = ','.join('?' * len(cache_keys))
-        query = f"""
-            SELECT cache_key, translation
-            FROM translations
-            WHERE cache_key IN ({placeholders})
-        """
-        cursor = self.conn.execute(query, cache_keys)
-
-        # Build reverse lookup: cache_key -> translation
-        key_to_translation = {row[0]: row[1] for row in cursor}
+        key_to_translation = {}
+        for start in range(0, len(cache_keys), _GET_MANY_CHUNK):
+            chunk = cache_keys[start:start + _GET_MANY_CHUNK]
+            placeholders = ','.join('?' * len(chunk))
+            query = f"""
+                SELECT cache_key, translation
+                FROM translations
+                WHERE cache_key IN ({placeholders})
+            """
+            key_to_translation.update(self.conn.execute(query, chunk))
 
         # Map back to original texts
         for text, cache_key in key_map.items():
@@ -174,12 +181,12 @@ class TranslationCache:
             for text, translation in data.items()
         ]
 
-        # Use REPLACE to update existing entries
-        self.conn.executemany(
-            "REPLACE INTO translations (cache_key, translation) VALUES (?, ?)",
-            rows
-        )
-        self.conn.commit()
+        # Use REPLACE to update existing entries, all in one transaction
+        with self.conn:
+            self.conn.executemany(
+                "REPLACE INTO translations (cache_key, translation) VALUES (?, ?)",
+                rows
+            )
 
         logger.info(f"Cached {len(rows)} new translations")
 
@@ -209,3 +216,72 @@ class TranslationCache:
             "oldest": row[1],
             "newest": row[2]
         }
+
+
+class PageHashCache:
+    """SQLite sidecar remembering the content hash of each processed page.
+
+    Features:
+    - BLAKE2b digest of the fetched HTML per source URL
+    - Output path recorded alongside for diagnostics
+    - Lock-guarded persistent connection shared by batch workers
+    """
+
+    def __init__(self, cache_path: str):
+        """Initialize cache.
+
+        Args:
+            cache_path: Path to SQLite database file
+        """
+        self.cache_path = Path(cache_path)
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(self.cache_path),
+            check_same_thread=False,  # Shared by batch worker threads
+            timeout=5.0
+        )
+        self._conn.execute("PRAGMA busy_timeout = 5000")
+        with self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS page_hashes (
+                    url TEXT PRIMARY KEY,
+                    content_hash TEXT NOT NULL,
+                    output_path TEXT NOT NULL,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+
+    @staticmethod
+    def hash_content(html: str) -> str:
+        """Return a stable digest of page HTML."""
+        return hashlib.blake2b(html.encode('utf-8'), digest_size=16).hexdigest()
+
+    def get(self, url: str) -> Optional[str]:
+        """Return the stored content hash for url, or None if unseen."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT content_hash FROM page_hashes WHERE url = ?", (url,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def set(self, url: str, content_hash: str, output_path: str) -> None:
+        """Record the content hash and output path for url."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "REPLACE INTO page_hashes (url, content_hash, output_path) VALUES (?, ?, ?)",
+                (url, content_hash, output_path)
+            )
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self):
+        """Context manager entry."""
+        return self
+
+    def __exit__(self, *args):
+        """Context manager exit - ensures connection cleanup."""
+        self.close()
@@ -21,6 +21,8 @@ from src.config.settings import (
 from src.config.constants import (
     BATCH_SIZE,
     MAX_TOKENS_PER_BATCH,
+    RATE_LIMIT_BACKOFF,
+    RATE_LIMIT_MAX_BACKOFF,
     TRANSLATION_TEMPERATURE,
     LANGUAGE_MAP,
     ENGLISH_STOPWORDS,
@@ -42,6 +44,8 @@ __all__ = [
     # Constants
     'BATCH_SIZE',
     'MAX_TOKENS_PER_BATCH',
+    'RATE_LIMIT_BACKOFF',
+    'RATE_LIMIT_MAX_BACKOFF',
     'TRANSLATION_TEMPERATURE',
     'LANGUAGE_MAP',
     'ENGLISH_STOPWORDS',
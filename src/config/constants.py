@@ -6,6 +6,8 @@ Configuration values that don't change at runtime.
 # Batching parameters
 BATCH_SIZE = 20  # texts per API call
 MAX_TOKENS_PER_BATCH = 2000  # max tokens to generate
+RATE_LIMIT_BACKOFF = 2.0  # seconds to wait before re-sending a halved batch after 429
+RATE_LIMIT_MAX_BACKOFF = 30.0  # cap for the wait, which doubles on consecutive 429s
 
 # Translation parameters
 TRANSLATION_TEMPERATURE = 0.3  # Lower = more deterministic
@@ -1,9 +1,13 @@
 """HTTP fetcher with retry logic and validation"""
+import re
 import time
 import logging
 import socket
 import ipaddress
 import atexit
+import importlib.util
+import threading
+from functools import lru_cache
 from urllib.parse import urlparse
 import httpx
 
@@ -11,6 +15,10 @@ logger = logging.getLogger(__name__)
 
 # Module-level HTTP client for connection pooling
 _client: httpx.Client | None = None
+_client_lock = threading.Lock()
+
+# HTTP/2 multiplexing needs the optional 'h2' package (httpx[http2])
+_HTTP2_AVAILABLE = importlib.util.find_spec('h2') is not None
 
 
 class FetchError(Exception):
@@ -28,6 +36,8 @@ PRIVATE_IP_RANGES = [
     ipaddress.ip_network('10.0.0.0/8'),
     ipaddress.ip_network('172.16.0.0/12'),
     ipaddress.ip_network('192.168.0.0/16'),
+    ipaddress.ip_network('100.64.0.0/10'),   # Carrier-grade NAT
+    ipaddress.ip_network('0.0.0.0/8'),       # "This" network
     ipaddress.ip_network('169.254.0.0/16'),  # Link-local
     ipaddress.ip_network('127.0.0.0/8'),     # Loopback
     ipaddress.ip_network('::1/128'),         # IPv6 loopback
@@ -38,6 +48,67 @@ PRIVATE_IP_RANGES = [
 # Cloud metadata endpoints
 METADATA_IPS = ['169.254.169.254']
 
+# Hostnames that always point back at this machine (trailing dot allowed)
+_LOCALHOST_RE = re.compile(r'^localhost(?:\.localdomain)?\.?$', re.IGNORECASE)
+
+# IP literals (dotted IPv4 or bracket-stripped IPv6) need no DNS lookup
+_IP_LITERAL_RE = re.compile(r'^(?:\d{1,3}(?:\.\d{1,3}){3}|[0-9a-f:.]*:[0-9a-f:.%]*)$', re.IGNORECASE)
+
+
+@lru_cache(maxsize=4096)
+def _ip_block_reason(ip_str: str) -> str | None:
+    """
+    Classify an IP address string; return the block message or None.
+
+    Memoized because batch runs resolve the same few hosts to the same
+    addresses over and over. Only the pure address classification is
+    cached - DNS resolution still happens on every validate_url call.
+    Raises ValueError if ip_str is not an IP address.
+    """
+    # Pick the address family up front: ip_address() would try (and fail)
+    # IPv4 parsing before every IPv6 literal
+    if ':' in ip_str:
+        ip = ipaddress.IPv6Address(ip_str.split('%', 1)[0])
+        # ::ffff:10.0.0.1 reaches the same host as 10.0.0.1
+        if ip.ipv4_mapped is not None:
+            ip = ip.ipv4_mapped
+    else:
+        ip = ipaddress.IPv4Address(ip_str)
+
+    # Block cloud metadata endpoint (before the broader link-local check)
+    if str(ip) in METADATA_IPS:
+        return f"Cloud metadata endpoint blocked: {ip_str}"
+
+    # Block 0.0.0.0 / :: (reaches local services on most systems)
+    if ip.is_unspecified:
+        return f"Unspecified address blocked: {ip_str}"
+
+    # Block loopback
+    if ip.is_loopback:
+        return f"Loopback address blocked: {ip_str}"
+
+    # Block link-local
+    if ip.is_link_local:
+        return f"Link-local address blocked: {ip_str}"
+
+    # Block private IP ranges
+    private_range = next((n for n in PRIVATE_IP_RANGES if ip in n), None)
+    if private_range is not None:
+        return f"Private IP address blocked: {ip_str} (in {private_range})"
+
+    # Block multicast and reserved (240.0.0.0/4 etc.) addresses
+    if ip.is_multicast or ip.is_reserved:
+        return f"Reserved address blocked: {ip_str}"
+
+    return None
+
+
+def _check_ip(ip_str: str) -> None:
+    """Raise SSRFError if a resolved or literal IP address is blocked."""
+    reason = _ip_block_reason(ip_str)
+    if reason is not None:
+        raise SSRFError(reason)
+
 
 def validate_url(url: str) -> None:
     """
@@ -47,8 +118,9 @@ def validate_url(url: str) -> None:
     - Non-HTTP(S) schemes
     - Localhost, 127.0.0.1, 0.0.0.0, ::1
     - Cloud metadata endpoint (169.254.169.254)
-    - Private IP ranges (10.x, 172.16-31.x, 192.168.x)
-    - Link-local addresses
+    - Private IP ranges (10.x, 172.16-31.x, 192.168.x, 100.64-127.x)
+    - Link-local, multicast and reserved addresses
+    - IPv4-mapped IPv6 forms of all of the above
 
     Raises SSRFError if URL is blocked.
     """
@@ -65,10 +137,17 @@ def validate_url(url: str) -> None:
         raise SSRFError("URL must contain a hostname")
 
     # Block localhost variants
-    localhost_names = {'localhost', 'localhost.localdomain'}
-    if hostname.lower() in localhost_names:
+    if _LOCALHOST_RE.match(hostname):
         raise SSRFError(f"Access to localhost is blocked")
 
+    # IP literals are checked directly; only real hostnames hit DNS
+    if _IP_LITERAL_RE.match(hostname):
+        try:
+            _check_ip(hostname)
+            return
+        except ValueError:
+            pass  # Not a valid address after all; let the resolver decide
+
     # Resolve hostname to IP and validate
     try:
         # Get all IP addresses for this hostname
@@ -76,34 +155,7 @@ def validate_url(url: str) -> None:
         ips = {info[4][0] for info in addr_info}
 
         for ip_str in ips:
-            # Parse as IP address
-            ip = ipaddress.ip_address(ip_str)
-
-            # Block loopback
-            if ip.is_loopback:
-                raise SSRFError(
-                    f"Loopback address blocked: {ip_str}"
-                )
-
-            # Block link-local
-            if ip.is_link_local:
-                raise SSRFError(
-                    f"Link-local address blocked: {ip_str}"
-                )
-
-            # Block cloud metadata endpoint
-            if ip_str in METADATA_IPS:
-                raise SSRFError(
-                    f"Cloud metadata endpoint blocked: {ip_str}"
-                )
-
-            # Block private IP ranges
-            for private_range in PRIVATE_IP_RANGES:
-                if ip in private_range:
-                    raise SSRFError(
-                        f"Private IP address blocked: {ip_str} "
-                        f"(in {private_range})"
-                    )
+            _check_ip(ip_str)
 
     except socket.gaierror as e:
         raise SSRFError(f"Failed to resolve hostname: {e}") from e
@@ -114,22 +166,28 @@ def _get_client() -> httpx.Client:
     Get or create the module-level HTTP client with connection pooling.
 
     Configured with:
-    - Connection pooling (max 10 connections, 5 keepalive)
+    - Connection pooling (max 64 connections, 32 keepalive) shared by
+      concurrent batch workers
+    - HTTP/2 when the optional h2 package is installed
     - 10s default timeout
     - Automatic redirect following
     - Cleanup registered with atexit
     """
     global _client
     if _client is None:
-        _client = httpx.Client(
-            timeout=httpx.Timeout(10.0),
-            limits=httpx.Limits(
-                max_connections=10,
-                max_keepalive_connections=5
-            ),
-            follow_redirects=True
-        )
-        atexit.register(_client.close)
+        with _client_lock:
+            if _client is None:
+                client = httpx.Client(
+                    http2=_HTTP2_AVAILABLE,
+                    timeout=httpx.Timeout(10.0),
+                    limits=httpx.Limits(
+                        max_connections=64,
+                        max_keepalive_connections=32
+                    ),
+                    follow_redirects=True
+                )
+                atexit.register(client.close)
+                _client = client
     return _client
 
 
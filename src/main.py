@@ -54,6 +54,17 @@ def main():
         default=1.0,
         help='Delay between requests in seconds (default: 1.0)'
     )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=5,
+        help='Number of sitemap URLs processed concurrently (default: 5)'
+    )
+    parser.add_argument(
+        '--skip-unchanged',
+        action='store_true',
+        help='Skip sitemap pages whose HTML is unchanged since the last run'
+    )
     parser.add_argument(
         '--log-file',
         help='Path to log file (optional)'
@@ -108,6 +119,8 @@ def main():
         parser.error("Either --url or --sitemap is required")
     if args.url and args.sitemap:
         parser.error("Cannot use both --url and --sitemap (mutually exclusive)")
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
 
     # Check translation API access
     if not args.dry_run and not has_model('de', 'en'):
@@ -132,7 +145,12 @@ def main():
             output_dir=args.output_dir,
             delay=args.delay,
             log_file=getattr(args, 'log_file', None),
-            dry_run=args.dry_run
+            dry_run=args.dry_run,
+            max_workers=args.workers,
+            page_cache_path=(
+                str(Path(args.output_dir) / '.page_hashes.db')
+                if args.skip_unchanged else None
+            )
         )
 
         sys.exit(0 if results['failed'] == 0 else 1)
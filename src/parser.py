@@ -179,27 +179,33 @@ def _is_translatable_text_node(string: NavigableString) -> bool:
     if '<' in text:
         return False
 
-    parents = [parent for parent in string.parents if getattr(parent, "name", None)]
+    # One walk up the ancestors: any excluded tag vetoes, else need an allowed one
+    allowed = False
+    for parent in string.parents:
+        name = parent.name
+        if name in EXCLUDED_TAGS:
+            return False
+        if name in ALLOWED_TAGS:
+            allowed = True
 
-    if any(parent.name in EXCLUDED_TAGS for parent in parents):
-        return False
-
-    return any(parent.name in ALLOWED_TAGS for parent in parents)
+    return allowed
 
 
 def _collect_fragment_items(fragment: EmbeddedHtmlFragment) -> list[EmbeddedHtmlItem]:
-    collected: list[EmbeddedHtmlItem] = []
-
-    for string in fragment.soup.find_all(string=True):
-        if isinstance(string, NavigableString) and _is_translatable_text_node(string):
-            collected.append(EmbeddedHtmlItem(fragment=fragment, node=string))
+    texts: list[EmbeddedHtmlItem] = []
+    attrs: list[EmbeddedHtmlItem] = []
 
-    for tag in fragment.soup.find_all(True):
-        for attr in TRANSLATABLE_ATTRS:
-            if tag.has_attr(attr) and tag[attr].strip():
-                collected.append(EmbeddedHtmlItem(fragment=fragment, node=tag, attr=attr))
+    # Single walk; text items still precede attribute items
+    for node in fragment.soup.descendants:
+        if isinstance(node, NavigableString):
+            if _is_translatable_text_node(node):
+                texts.append(EmbeddedHtmlItem(fragment=fragment, node=node))
+        elif isinstance(node, Tag):
+            for attr in TRANSLATABLE_ATTRS:
+                if node.has_attr(attr) and node[attr].strip():
+                    attrs.append(EmbeddedHtmlItem(fragment=fragment, node=node, attr=attr))
 
-    return collected
+    return texts + attrs
 
 
 def _collect_json_items(script_tag: Tag, payload: Any) -> list[JsonFieldItem]:
@@ -230,34 +236,43 @@ def parse(html: str) -> tuple[BeautifulSoup, list]:
     - (tag, attr_name) tuples for attributes
     """
     soup = BeautifulSoup(html, 'lxml')
-    items = []
 
-    # Collect text nodes from allowed tags
-    for string in soup.find_all(string=True):
-        # Skip real HTML comments
-        if isinstance(string, Comment):
+    # Single walk over the tree; buckets keep the established item order
+    texts: list = []
+    attrs: list = []
+    metas: list = []
+    scripts: list[Tag] = []
+
+    for node in soup.descendants:
+        if isinstance(node, NavigableString):
+            # Skip real HTML comments
+            if not isinstance(node, Comment) and _is_translatable_text_node(node):
+                texts.append(node)
             continue
-        if not isinstance(string, NavigableString):
+        if not isinstance(node, Tag):
             continue
-        if _is_translatable_text_node(string):
-            items.append(string)
 
-    # Collect translatable attributes
-    for tag in soup.find_all(True):  # All tags
+        # Collect translatable attributes
         for attr in TRANSLATABLE_ATTRS:
-            if tag.has_attr(attr) and tag[attr].strip():
-                items.append((tag, attr))
+            if node.has_attr(attr) and node[attr].strip():
+                attrs.append((node, attr))
+
+        if node.name == 'meta':
+            # Collect meta description/keywords
+            meta_name = node.get('name')
+            meta_property = node.get('property')
+            if meta_name in META_NAME_FIELDS or meta_property in META_PROPERTY_FIELDS:
+                if node.has_attr('content') and node['content'].strip():
+                    metas.append((node, 'content'))
+        elif node.name == 'script':
+            scripts.append(node)
 
-    # Collect meta description/keywords
-    for meta in soup.find_all('meta'):
-        meta_name = meta.get('name')
-        meta_property = meta.get('property')
-        if meta_name in META_NAME_FIELDS or meta_property in META_PROPERTY_FIELDS:
-            if meta.has_attr('content') and meta['content'].strip():
-                items.append((meta, 'content'))
+    items = texts + attrs + metas
 
     # Collect JSON-LD content
-    for script in soup.find_all('script', attrs={'type': 'application/ld+json'}):
+    for script in scripts:
+        if script.get('type') != 'application/ld+json':
+            continue
         script_text = script.string
         if not script_text or not script_text.strip():
             continue
@@ -270,7 +285,7 @@ def parse(html: str) -> tuple[BeautifulSoup, list]:
         items.extend(json_items)
 
     # Collect embedded HTML fragments inside scripts
-    for script in soup.find_all('script'):
+    for script in scripts:
         script_text = script.string
         if not script_text or not script_text.strip():
             continue
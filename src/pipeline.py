@@ -5,6 +5,8 @@ from pathlib import Path
 from typing import Optional
 from urllib.parse import urlparse
 
+from bs4 import NavigableString
+
 from src.fetcher import fetch
 from src.parser import EmbeddedHtmlItem, JsonFieldItem, parse
 from src.translator import TranslationContext, preview_batch, translate_batch
@@ -27,7 +29,10 @@ def extract_texts(items: list) -> list[str]:
     """
     texts = []
     for item in items:
-        if isinstance(item, tuple):
+        # Text nodes are the bulk of items; test for them first
+        if isinstance(item, NavigableString):
+            texts.append(str(item))
+        elif isinstance(item, tuple):
             tag, attr = item
             texts.append(tag[attr])
         elif isinstance(item, JsonFieldItem):
@@ -6,6 +6,7 @@ import argparse
 import json
 import logging
 import shutil
+import zipfile
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Iterable, Optional
@@ -23,12 +24,14 @@ LOGGER = logging.getLogger(__name__)
 
 @dataclass(frozen=True)
 class StaticSiteConfig:
-    """Resolved paths required to build the static site."""
+    """Resolved paths (and package compression) required to build the static site."""
 
     output_dir: Path
     site_dir: Path
     source_dir: Path
     target_dir: Path
+    compression: int = zipfile.ZIP_DEFLATED
+    compresslevel: Optional[int] = None
 
 
 def parse_arguments(argv: Optional[Iterable[str]] = None) -> argparse.Namespace:
@@ -110,7 +113,12 @@ def write_meta_json(package_entries, site_dir: Path) -> None:
 def copy_packages(config: StaticSiteConfig) -> None:
     """Generate ZIP archives and copy them into the static site."""
     state = ViewerState(config.source_dir, config.target_dir)
-    packages = ensure_packages(state, config.output_dir)
+    packages = ensure_packages(
+        state,
+        config.output_dir,
+        compression=config.compression,
+        compresslevel=config.compresslevel,
+    )
     site_packages_dir = config.site_dir / "packages"
     site_packages_dir.mkdir(parents=True, exist_ok=True)
 
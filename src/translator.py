@@ -5,6 +5,8 @@ from __future__ import annotations
 import logging
 import math
 import re
+import threading
+import time
 from contextlib import contextmanager
 from dataclasses import dataclass, field
 from pathlib import Path
@@ -20,15 +22,31 @@ from src.config import (
     HF_MAX_RETRIES,
     LANGUAGE_MAP,
     MAX_TOKENS_PER_BATCH,
+    RATE_LIMIT_BACKOFF,
+    RATE_LIMIT_MAX_BACKOFF,
     get_backend_name,
     get_model_id,
 )
-from src.hf_client import AuthenticationError, HfApiError, HfClient
+from src.hf_client import AuthenticationError, HfApiError, HfClient, RateLimitError
 
 logger = logging.getLogger(__name__)
 
 _MAX_LOG_SNIPPET = 80
 
+# Soft hyphen, zero-width space, zero-width non-joiner, zero-width joiner
+_INVISIBLE_CHARS_TABLE = str.maketrans("", "", "\u00AD\u200B\u200C\u200D")
+
+# _looks_english only considers plain ASCII prose
+_ENGLISH_CHARS_RE = re.compile(r"[a-zA-Z0-9\s.,!?\'\"()-]+")
+_WORD_STRIP_CHARS = ".,!?\'\"()-[]{}:;"
+# Cheap pre-check: no stopword anywhere means the ratio test cannot pass
+_ENGLISH_STOPWORD_RE = re.compile(
+    r"\b(?:" + "|".join(sorted(ENGLISH_STOPWORDS)) + r")\b", re.IGNORECASE
+)
+
+# Bullets, pipes, dashes and blanks used as visual separators in markup
+_SEPARATORS_ONLY_RE = re.compile("[|·•\u00A0\u2022\u2023\\-–—\t ]+")
+
 
 @dataclass
 class TranslationContext:
@@ -43,6 +61,7 @@ class TranslationContext:
 
     cache: Optional[TranslationCache] = None
     argos_translators: dict[tuple[str, str], Any] = field(default_factory=dict)
+    argos_lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
 
     @classmethod
     def create(cls, cache_enabled: bool = True, cache_path: Optional[str] = None) -> TranslationContext:
@@ -119,12 +138,7 @@ class ArgosTranslationError(Exception):
 def _normalize_text(text: str) -> str:
     """Remove soft hyphens and other invisible characters."""
 
-    return (
-        text.replace("\u00AD", "")  # Soft hyphen
-        .replace("\u200B", "")  # Zero-width space
-        .replace("\u200C", "")  # Zero-width non-joiner
-        .replace("\u200D", "")  # Zero-width joiner
-    )
+    return text.translate(_INVISIBLE_CHARS_TABLE)
 
 
 def _is_punctuation_only(text: str) -> bool:
@@ -133,28 +147,28 @@ def _is_punctuation_only(text: str) -> bool:
     cleaned = text.strip()
     if not cleaned:
         return True
-    return all(c in "|·•\u00A0\u2022\u2023-–—\t " for c in cleaned)
+    return _SEPARATORS_ONLY_RE.fullmatch(cleaned) is not None
 
 
 def _looks_english(text: str) -> bool:
     """Heuristic: likely English if ASCII only and contains stopwords."""
 
-    if not re.match(r"^[a-zA-Z0-9\s.,!?\'\"()-]+$", text):
+    if not _ENGLISH_CHARS_RE.fullmatch(text) or not _ENGLISH_STOPWORD_RE.search(text):
         return False
-    words: list[str] = []
-    for raw_word in text.lower().split():
-        cleaned = raw_word.strip(".,!?\'\"()-[]{}:;")
-        if cleaned:
-            words.append(cleaned)
+    words = [
+        cleaned
+        for cleaned in (raw_word.strip(_WORD_STRIP_CHARS) for raw_word in text.lower().split())
+        if cleaned
+    ]
 
     if not words:
         return False
 
-    stopwords = [word for word in words if word in ENGLISH_STOPWORDS]
+    stopword_count = sum(1 for word in words if word in ENGLISH_STOPWORDS)
     if len(words) <= 4:
-        return len(stopwords) >= 1 and (len(stopwords) / len(words)) >= 0.25
+        return stopword_count >= 1 and (stopword_count / len(words)) >= 0.25
 
-    return len(stopwords) >= 2 and (len(stopwords) / len(words)) >= 0.3
+    return stopword_count >= 2 and (stopword_count / len(words)) >= 0.3
 
 
 def _estimate_tokens(text: str) -> int:
@@ -194,11 +208,9 @@ def _build_translation_plan(
         dst: Destination language code
         backend: Translation backend to use
         use_cache: Whether to use cache
-        context: Translation context (uses default if None)
+        context: Translation context (uses default if None; only resolved
+            when a cache lookup is actually needed)
     """
-    if context is None:
-        context = _get_default_context()
-
     total = len(texts)
     results: list[Optional[str]] = list(texts)
     pending: list[TranslationItem] = []
@@ -238,7 +250,11 @@ def _build_translation_plan(
             candidate_count=candidate_count,
         )
 
-    cache = context.cache if (use_cache and backend != "argos") else None
+    cache = None
+    if use_cache and backend != "argos":
+        if context is None:
+            context = _get_default_context()
+        cache = context.cache
     if cache:
         cache_keys = [item.normalized for item in pending]
         cached = cache.get_many(cache_keys, src, dst, cache_tag)
@@ -327,9 +343,6 @@ def translate_batch(
         dry_run: If True, only preview without actual translation
         context: Translation context (uses default if None)
     """
-    if context is None:
-        context = _get_default_context()
-
     if not texts:
         return []
 
@@ -348,6 +361,9 @@ def translate_batch(
         logger.info("All translations served from cache!")
         return plan.finalize(texts)
 
+    if context is None:
+        context = _get_default_context()
+
     if not has_model(src, dst, context=context):
         if backend == "argos":
             raise RuntimeError(
@@ -367,12 +383,17 @@ def translate_batch(
             batch_number = 0
             cursor = 0
             total_items = len(pending_items)
+            # Shrinks when the API rate-limits a batch; never grows back within a call
+            batch_limit = BATCH_SIZE
+            # Doubles on consecutive 429s (capped), back to the base after a success
+            backoff = RATE_LIMIT_BACKOFF
 
             while cursor < total_items:
+                batch_start = cursor
                 batch_items: list[TranslationItem] = []
                 token_total = 0
 
-                while cursor < total_items and len(batch_items) < BATCH_SIZE:
+                while cursor < total_items and len(batch_items) < batch_limit:
                     item = pending_items[cursor]
                     estimated = _estimate_tokens(item.normalized)
 
@@ -388,16 +409,40 @@ def translate_batch(
                     cursor += 1
 
                 batch_number += 1
-                batch_texts = [item.normalized for item in batch_items]
 
-                logger.info(
-                    "Translating batch %d (%d texts, ~%d tokens)",
-                    batch_number,
-                    len(batch_texts),
-                    token_total,
-                )
+                while True:
+                    batch_texts = [item.normalized for item in batch_items]
+
+                    logger.info(
+                        "Translating batch %d (%d texts, ~%d tokens)",
+                        batch_number,
+                        len(batch_texts),
+                        token_total,
+                    )
 
-                translations = translate_fn(batch_texts)
+                    try:
+                        translations = translate_fn(batch_texts)
+                        break
+                    except RateLimitError:
+                        if len(batch_items) <= 1:
+                            raise
+                        batch_limit = max(1, len(batch_items) // 2)
+                        logger.warning(
+                            "Rate limited on batch %d; retrying with at most %d texts in %.1fs",
+                            batch_number,
+                            batch_limit,
+                            backoff,
+                        )
+                        time.sleep(backoff)
+                        backoff = min(backoff * 2, RATE_LIMIT_MAX_BACKOFF)
+                        # Retry the head of this batch; the rest is packed again later
+                        del batch_items[batch_limit:]
+                        cursor = batch_start + batch_limit
+                        token_total = sum(
+                            _estimate_tokens(item.normalized) for item in batch_items
+                        )
+
+                backoff = RATE_LIMIT_BACKOFF
 
                 if len(translations) != len(batch_items):
                     logger.warning(
@@ -569,6 +614,10 @@ def _find_argos_translator(languages: list, src: str, dst: str) -> Optional[obje
 def _load_argos_translator(src: str, dst: str, context: TranslationContext) -> Optional[object]:
     """Load (and cache) an Argos translator for the given language pair.
 
+    Enumerating installed Argos languages scans the package directory on
+    disk, so the result (including a miss) is cached per context. The lock
+    keeps concurrent batch workers from all scanning on the first call.
+
     Args:
         src: Source language code
         dst: Destination language code
@@ -578,6 +627,14 @@ def _load_argos_translator(src: str, dst: str, context: TranslationContext) -> O
     if key in context.argos_translators:
         return context.argos_translators[key]
 
+    with context.argos_lock:
+        if key not in context.argos_translators:
+            context.argos_translators[key] = _scan_argos_translator(src, dst)
+        return context.argos_translators[key]
+
+
+def _scan_argos_translator(src: str, dst: str) -> Optional[object]:
+    """Look up the installed Argos translator for src -> dst (uncached)."""
     try:
         from argostranslate import translate as argos_translate
     except ImportError:
@@ -585,14 +642,12 @@ def _load_argos_translator(src: str, dst: str, context: TranslationContext) -> O
             "TRANSLATOR_BACKEND=argos but argostranslate is not installed. "
             "Run `pip install argostranslate argostranslate-models` to enable the fallback."
         )
-        context.argos_translators[key] = None
         return None
 
     try:
         languages = argos_translate.load_installed_languages()
     except Exception as exc:
         logger.error("Failed to load Argos languages: %s", exc)
-        context.argos_translators[key] = None
         return None
 
     translator = _find_argos_translator(languages, src, dst)
@@ -607,7 +662,6 @@ def _load_argos_translator(src: str, dst: str, context: TranslationContext) -> O
             dst,
         )
 
-    context.argos_translators[key] = translator
     return translator
 
 
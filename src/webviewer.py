@@ -6,10 +6,12 @@ import argparse
 import errno
 import json
 import logging
+import os
 import shutil
 import sys
 import threading
 import webbrowser
+import zipfile
 from dataclasses import dataclass
 from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path, PurePosixPath
@@ -81,30 +83,46 @@ def build_file_tree(directory: Path, *, base: Optional[Path] = None) -> List[Dic
     """
     if base is None:
         base = directory
+    prefix = directory.relative_to(base).as_posix()
+    return _scan_file_tree(str(directory), "" if prefix == "." else f"{prefix}/")
+
+
+def _scan_file_tree(directory: str, prefix: str) -> List[Dict[str, Any]]:
+    """One ``os.scandir`` pass per directory; ``DirEntry`` type checks reuse readdir data."""
+    dirs: List[os.DirEntry] = []
+    files: List[os.DirEntry] = []
+    with os.scandir(directory) as it:
+        for entry in it:
+            if entry.is_dir():
+                dirs.append(entry)
+            elif entry.is_file():
+                files.append(entry)
+
+    def sort_key(entry: os.DirEntry) -> tuple[str, str]:
+        return entry.name.lower(), entry.name
+
+    dirs.sort(key=sort_key)
+    files.sort(key=sort_key)
 
     entries: List[Dict[str, Any]] = []
-    for child in sorted(
-        directory.iterdir(),
-        key=lambda path: (path.is_file(), path.name.lower()),
-    ):
-        if child.is_dir():
-            subtree = build_file_tree(child, base=base)
-            entries.append(
-                {
-                    "type": "directory",
-                    "name": child.name,
-                    "path": str(child.relative_to(base).as_posix()),
-                    "children": subtree,
-                }
-            )
-        elif child.is_file():
-            entries.append(
-                {
-                    "type": "file",
-                    "name": child.name,
-                    "path": str(child.relative_to(base).as_posix()),
-                }
-            )
+    for entry in dirs:
+        path = prefix + entry.name
+        entries.append(
+            {
+                "type": "directory",
+                "name": entry.name,
+                "path": path,
+                "children": _scan_file_tree(entry.path, f"{path}/"),
+            }
+        )
+    for entry in files:
+        entries.append(
+            {
+                "type": "file",
+                "name": entry.name,
+                "path": prefix + entry.name,
+            }
+        )
     return entries
 
 
@@ -115,15 +133,20 @@ def _safe_relative_path(raw_path: str) -> Path:
     Raises:
         ValueError: If the path is absolute or attempts directory traversal.
     """
+    if raw_path.startswith("/"):
+        raise ValueError("Absolute paths are not allowed")
+
+    # Backslashes are separators on Windows ("..\\x" would escape there)
+    if "\\" in raw_path:
+        raise ValueError("Path traversal is not allowed")
+
     try:
         pure = PurePosixPath(raw_path)
     except ValueError as exc:  # pragma: no cover - defensive
         raise ValueError("Invalid path encoding") from exc
 
-    if pure.is_absolute():
-        raise ValueError("Absolute paths are not allowed")
-
-    if any(part in ("..", "") for part in pure.parts):
+    # Only paths that contain ".." at all need the component check
+    if ".." in raw_path and ".." in pure.parts:
         raise ValueError("Path traversal is not allowed")
 
     return Path(*pure.parts)
@@ -157,28 +180,53 @@ def load_document(state: ViewerState, relative_path: Path) -> Dict[str, Any]:
     }
 
 
-def ensure_packages(state: ViewerState, output_root: Path) -> List[PackageInfo]:
+def _write_zip_archive(
+    archive_path: Path,
+    directory: Path,
+    compression: int,
+    compresslevel: Optional[int],
+) -> None:
+    """Archive ``directory`` (including its own name as the top-level folder)."""
+    # Arcnames are sliced off the walked string paths, so no Path per entry
+    prefix_len = len(os.path.join(str(directory.parent), ""))
+    to_posix = os.sep != "/"
+    with zipfile.ZipFile(
+        archive_path, "w", compression=compression, compresslevel=compresslevel
+    ) as archive:
+        for current, dirs, files in os.walk(directory):
+            dirs.sort()
+            arc_dir = current[prefix_len:]
+            if to_posix:
+                arc_dir = arc_dir.replace(os.sep, "/")
+            archive.write(current, arc_dir)
+            for name in sorted(files):
+                archive.write(os.path.join(current, name), f"{arc_dir}/{name}")
+
+
+def ensure_packages(
+    state: ViewerState,
+    output_root: Path,
+    compression: int = zipfile.ZIP_DEFLATED,
+    compresslevel: Optional[int] = None,
+) -> List[PackageInfo]:
     """
     Create ZIP archives for the source and target directories to enable downloads.
+
+    ``compression``/``compresslevel`` are passed to :class:`zipfile.ZipFile`;
+    ``zipfile.ZIP_STORED`` skips DEFLATE when the archives are throwaway.
     """
     packages_dir = output_root / "packages"
     packages_dir.mkdir(parents=True, exist_ok=True)
 
     packages: List[PackageInfo] = []
     for language, directory in (("de", state.source_dir), ("en", state.target_dir)):
-        base_name = f"{language}-{directory.name}"
-        archive_base = packages_dir / base_name
-        archive_path = shutil.make_archive(
-            str(archive_base),
-            "zip",
-            root_dir=directory.parent,
-            base_dir=directory.name,
-        )
+        archive_path = packages_dir / f"{language}-{directory.name}.zip"
+        _write_zip_archive(archive_path, directory, compression, compresslevel)
         packages.append(
             PackageInfo(
                 language=language,
                 directory=directory,
-                archive_path=Path(archive_path),
+                archive_path=archive_path,
             )
         )
     return packages
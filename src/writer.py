@@ -1,7 +1,9 @@
 """HTML writer with translation application and link rewriting"""
 import json
 import logging
+import os
 import re
+from functools import lru_cache
 from pathlib import Path
 from urllib.parse import urlparse
 from bs4 import BeautifulSoup, NavigableString
@@ -10,10 +12,25 @@ from src.parser import EmbeddedHtmlItem, JsonFieldItem, ScriptHtmlContext
 
 logger = logging.getLogger(__name__)
 
+# Path component of an absolute http(s) URL, without query or fragment.
+# Only matches where urlparse().path is the same string: printable-ASCII
+# netloc without brackets, and no ';params', tabs or newlines in the path.
+_HTTP_URL_PATH_RE = re.compile(
+    r'^https?://[!"$-.0->@-Z\\^-~]*((?:/[^?#;\t\r\n]*)?)(?=[?#]|\Z)', re.IGNORECASE
+)
+
+# Output paths may only contain these characters
+_UNSAFE_PATH_RE = re.compile(r'[^a-zA-Z0-9/_.-]')
+
 
 def _replace_text_node(node: NavigableString, translation: str) -> None:
     """Replace a NavigableString while preserving leading/trailing whitespace."""
     original = str(node)
+    # Common case: no surrounding whitespace to carry over
+    if not original[:1].isspace() and not original[-1:].isspace():
+        node.replace_with(translation)
+        return
+
     leading = len(original) - len(original.lstrip())
     trailing = len(original) - len(original.rstrip())
 
@@ -36,40 +53,32 @@ def apply_translations(soup: BeautifulSoup, items: list, translations: list[str]
     - JsonFieldItem: update JSON-LD payloads
     - EmbeddedHtmlItem: update HTML fragments embedded in scripts
     """
-    trans_idx = 0
     json_contexts: dict[int, JsonFieldItem] = {}
     fragment_contexts: dict[int, ScriptHtmlContext] = {}
 
-    for item in items:
+    # zip() stops at the shorter list, so missing translations leave items untouched.
+    # Checks are ordered by frequency: text nodes dominate, then attributes.
+    for item, translation in zip(items, translations):
         if isinstance(item, NavigableString):
             # Text node - preserve leading/trailing whitespace
-            if trans_idx < len(translations):
-                _replace_text_node(item, translations[trans_idx])
-                trans_idx += 1
+            _replace_text_node(item, translation)
 
         elif isinstance(item, tuple):
             # Attribute: (tag, attr_name)
             tag, attr_name = item
-            if trans_idx < len(translations):
-                tag[attr_name] = translations[trans_idx]
-                trans_idx += 1
+            tag[attr_name] = translation
 
         elif isinstance(item, JsonFieldItem):
-            if trans_idx < len(translations):
-                item.set_value(translations[trans_idx])
-                json_contexts[id(item.payload)] = item
-                trans_idx += 1
+            item.set_value(translation)
+            json_contexts[id(item.payload)] = item
 
         elif isinstance(item, EmbeddedHtmlItem):
-            if trans_idx < len(translations):
-                translation = translations[trans_idx]
-                if item.attr:
-                    item.node[item.attr] = translation
-                else:
-                    _replace_text_node(item.node, translation)
-                item.fragment.dirty = True
-                fragment_contexts[id(item.fragment.context)] = item.fragment.context
-                trans_idx += 1
+            if item.attr:
+                item.node[item.attr] = translation
+            else:
+                _replace_text_node(item.node, translation)
+            item.fragment.dirty = True
+            fragment_contexts[id(item.fragment.context)] = item.fragment.context
 
     # Persist JSON-LD updates
     for json_item in json_contexts.values():
@@ -84,6 +93,24 @@ def apply_translations(soup: BeautifulSoup, items: list, translations: list[str]
         context.commit()
 
 
+@lru_cache(maxsize=64)
+def _absolute_link_patterns(domain: str, from_prefix: str) -> tuple[tuple[str, str], re.Pattern]:
+    """
+    Prefixes and path regex for absolute same-domain links, compiled once per domain.
+
+    The regex captures the path after ``from_prefix`` and only matches when
+    urlparse would yield the same path (no ``;params``, tabs or newlines).
+    """
+    absolute_prefixes = (
+        f'https://{domain}{from_prefix}',
+        f'http://{domain}{from_prefix}',
+    )
+    path_re = re.compile(
+        rf'https?://{re.escape(domain)}{re.escape(from_prefix)}([^?#;\t\r\n]*)(?:[?#]|\Z)'
+    )
+    return absolute_prefixes, path_re
+
+
 def rewrite_links(soup: BeautifulSoup, from_prefix: str = '/de/', to_prefix: str = '/en/',
                   domain: str = 'www.landsiedel.com') -> None:
     """
@@ -93,16 +120,23 @@ def rewrite_links(soup: BeautifulSoup, from_prefix: str = '/de/', to_prefix: str
     - Root-relative links: /de/... -> /en/...
     - Absolute same-domain links: https://domain/de/... -> /en/...
     """
+    absolute_prefixes, absolute_path_re = _absolute_link_patterns(domain, from_prefix)
+    prefix_len = len(from_prefix)
+
+    # href=True already skips bare anchors; select()/lxml round-trips measured slower
     for a in soup.find_all('a', href=True):
         href = a['href']
 
         # Root-relative link
         if href.startswith(from_prefix):
-            a['href'] = href.replace(from_prefix, to_prefix, 1)
+            a['href'] = to_prefix + href[prefix_len:]
         # Absolute same-domain link
-        elif href.startswith(f'https://{domain}{from_prefix}') or \
-             href.startswith(f'http://{domain}{from_prefix}'):
-            # Extract path and rewrite
+        elif href.startswith(absolute_prefixes):
+            match = absolute_path_re.match(href)
+            if match is not None:
+                a['href'] = to_prefix + match.group(1)
+                continue
+            # Params or stripped control characters: let urlparse decide
             parsed = urlparse(href)
             if parsed.path.startswith(from_prefix):
                 new_path = parsed.path.replace(from_prefix, to_prefix, 1)
@@ -115,36 +149,67 @@ def set_lang(soup: BeautifulSoup, lang: str = 'en') -> None:
         soup.html['lang'] = lang
 
 
-def _validate_safe_path(path: str, output_base: Path) -> None:
+def output_tree_has_symlinks(output_dir: str) -> bool:
+    """
+    Return True if any entry below output_dir is a symbolic link.
+
+    A missing directory counts as symlink-free (it will be created by us).
+    Uses os.scandir so the link check reuses readdir's d_type instead of an
+    extra lstat per entry. The result is a snapshot: callers scan once per
+    run, so a symlink created while the run is in progress is not caught.
+    """
+    pending = [output_dir]
+    while pending:
+        try:
+            with os.scandir(pending.pop()) as it:
+                for entry in it:
+                    if entry.is_symlink():
+                        return True
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append(entry.path)
+        except OSError:
+            # Matches os.walk: unreadable or missing directories are skipped
+            continue
+    return False
+
+
+def _validate_safe_path(path: str, output_base: Path, trusted: bool = False) -> None:
     """
     Validate that a path is safe and does not traverse outside output directory.
 
+    With ``trusted=True`` the caller guarantees the output tree contains no
+    symlinks, so the string checks are sufficient and realpath() is skipped.
+
     Raises:
         ValueError: If path contains traversal attempts or unsafe characters
     """
-    # Check for '..' in path components
-    path_obj = Path(path)
-    if '..' in path_obj.parts:
+    # Check for '..' in path components (substring test first, it's cheap)
+    if '..' in path and '..' in path.split('/'):
         raise ValueError(f"Path traversal detected: path contains '..' component")
 
     # Validate path contains only safe characters
-    safe_pattern = re.compile(r'^[a-zA-Z0-9/_.-]+$')
-    if not safe_pattern.match(str(path_obj)):
+    if not path or _UNSAFE_PATH_RE.search(path):
         raise ValueError(f"Path contains unsafe characters: {path}")
 
-    # Resolve to absolute path and verify it starts with output_base
+    if trusted:
+        # Without symlinks, only an absolute path can still escape output_base
+        if path.startswith('/'):
+            raise ValueError(f"Path traversal detected: {path} is absolute")
+        return
+
+    # Canonicalize and verify the target stays inside output_base
     try:
-        resolved = (output_base / path_obj).resolve()
-        base_resolved = output_base.resolve()
+        base_real = os.path.realpath(output_base)
+        resolved = os.path.realpath(os.path.join(base_real, path))
 
-        # Check if resolved path is within output directory
-        if not str(resolved).startswith(str(base_resolved)):
+        # commonpath (unlike a string prefix) rejects siblings like out2/ for out/
+        if os.path.commonpath([resolved, base_real]) != base_real:
             raise ValueError(f"Path traversal detected: {path} resolves outside output directory")
     except (ValueError, OSError) as e:
         raise ValueError(f"Invalid path: {path}") from e
 
 
-def map_paths(url: str, output_dir: str) -> tuple[str, str]:
+def map_paths(url: str, output_dir: str, *, trusted_output: bool = False) -> tuple[str, str]:
     """
     Map URL to output file paths for DE and EN versions.
 
@@ -159,12 +224,16 @@ def map_paths(url: str, output_dir: str) -> tuple[str, str]:
     - Ensures output stays within output_dir
     - Blocks paths with '..' components
     - Validates safe characters only
+    - trusted_output=True skips filesystem canonicalization; only pass it
+      when output_tree_has_symlinks(output_dir) is False
 
     Raises:
         ValueError: If URL path contains traversal attempts or unsafe characters
     """
-    parsed = urlparse(url)
-    path = parsed.path
+    # Sitemap URLs are absolute http(s); slice the path out directly and only
+    # fall back to urlparse for anything else (e.g. ';params' are stripped there)
+    match = _HTTP_URL_PATH_RE.match(url)
+    path = match.group(1) if match else urlparse(url).path
 
     # Remove leading slash
     if path.startswith('/'):
@@ -183,7 +252,7 @@ def map_paths(url: str, output_dir: str) -> tuple[str, str]:
 
     # Validate path safety BEFORE constructing final paths
     output_base = Path(output_dir)
-    _validate_safe_path(path, output_base)
+    _validate_safe_path(path, output_base, trusted=trusted_output)
 
     de_path = str(output_base / 'de' / path)
     en_path = str(output_base / 'en' / path)
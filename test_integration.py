@@ -1,148 +1,153 @@
 #!/usr/bin/env python3
 """Integration tests for Qwen2.5-7B translation system"""
+import io
 import os
 import sys
-
-# Load environment variables
-try:
-    from dotenv import load_dotenv
-    load_dotenv()
-except ImportError:
-    pass
-
-from src.translator import translate_batch, has_model
-
-
-def test_api_token():
-    """Test 1: API Token Check"""
-    print("\n" + "="*60)
-    print("TEST 1: API Token Check")
-    print("="*60)
-
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+
+import pytest
+
+from tests._translate_cache import has_model_cached, translate_cached
+
+LANGUAGE_PAIRS = [
+    ('en', 'de', 'Hello', 'English→German'),
+    ('de', 'en', 'Hallo', 'German→English'),
+    ('fr', 'en', 'Bonjour', 'French→English'),
+    ('es', 'en', 'Hola', 'Spanish→English'),
+    ('ru', 'en', 'Привет', 'Russian→English'),
+    ('hi', 'en', 'नमस्ते', 'Hindi→English'),
+    ('zh', 'en', '你好', 'Chinese→English')
+]
+
+GERMAN_CASES = [
+    ("Hallo Welt", "Hello World"),
+    ("Guten Tag", "Good day"),
+    ("Wie geht es dir?", "How are you")
+]
+
+SKIP_CASES = [
+    ("", "empty string"),
+    ("   ", "whitespace only"),
+    ("•", "punctuation only"),
+    ("This is already English", "English text (ASCII + stopwords)")
+]
+
+
+# Shared checks: pytest tests and main() both run these and fail on assert
+
+def verify_api_token():
+    """HF_API_TOKEN is set, well-formed, and the live DE→EN backend answers."""
     token = os.getenv('HF_API_TOKEN')
-    if not token:
-        print("❌ FAIL: HF_API_TOKEN not set")
-        print("   Get token at: https://huggingface.co/settings/tokens")
-        return False
-
-    if not token.startswith('hf_'):
-        print("❌ FAIL: Invalid token format (should start with 'hf_')")
-        return False
+    assert token, "HF_API_TOKEN not set (get one at https://huggingface.co/settings/tokens)"
+    assert token.startswith('hf_'), "Invalid token format (should start with 'hf_')"
+    assert has_model_cached('de', 'en'), "has_model() returned False"
+    print("   Token: [REDACTED]")
 
-    if not has_model('de', 'en'):
-        print("❌ FAIL: has_model() returned False")
-        return False
 
-    print("✓ PASS: API Token configured correctly")
-    print("   Token: [REDACTED]")
-    return True
+def verify_german_to_english():
+    """German input yields non-trivial English translations (main use case)."""
+    # One batched request instead of one round-trip per text
+    translations = translate_cached([('de', 'en', de_text) for de_text, _ in GERMAN_CASES])
 
+    assert len(translations) == len(GERMAN_CASES)
+    for (de_text, _), translation in zip(GERMAN_CASES, translations):
+        print(f"   DE: {de_text}")
+        print(f"   EN: {translation}")
+        # Not an exact match due to LLM variations
+        assert len(translation) >= 2, f"Translation too short for {de_text!r}"
 
-def test_german_to_english():
-    """Test 2: German → English (main use case)"""
-    print("\n" + "="*60)
-    print("TEST 2: German → English Translation")
-    print("="*60)
 
-    test_cases = [
-        ("Hallo Welt", "Hello World"),
-        ("Guten Tag", "Good day"),
-        ("Wie geht es dir?", "How are you")
-    ]
+def verify_language_pairs(pairs):
+    """Each ``(src, dst, text, label)`` pair is available and yields a translation."""
+    for src, dst, _, label in pairs:
+        assert has_model_cached(src, dst), f"{label}: has_model() failed"
 
-    try:
-        for de_text, expected_en in test_cases:
-            result = translate_batch([de_text], src='de', dst='en')
-            translation = result[0]
+    # Misses are grouped per language pair, one request per pair
+    translations = translate_cached([(src, dst, text) for src, dst, text, _ in pairs])
 
-            print(f"\n   DE: {de_text}")
-            print(f"   EN: {translation}")
+    for (_, _, text, label), translation in zip(pairs, translations):
+        print(f"   {label}: {text} → {translation}")
+        assert len(translation) >= 1, f"Empty translation for {label}"
 
-            # Basic validation (not exact match due to LLM variations)
-            if len(translation) < 2:
-                print(f"   ❌ Translation too short")
-                return False
 
-        print("\n✓ PASS: All German→English translations successful")
-        return True
+def verify_skip_cases(cases):
+    """Empty, punctuation-only and English input is returned unchanged."""
+    translations = translate_cached([('de', 'en', text) for text, _ in cases])
 
-    except Exception as e:
-        print(f"❌ FAIL: {e}")
-        return False
+    for (text, description), translation in zip(cases, translations):
+        assert translation == text, (
+            f"Should skip but translated: {description} ({text!r} → {translation!r})"
+        )
+        print(f"   Skipped: {description}")
 
 
-def test_all_languages():
-    """Test 3: All 7 Required Languages"""
-    print("\n" + "="*60)
-    print("TEST 3: All 7 Required Languages")
-    print("="*60)
+@pytest.mark.integration
+def test_api_token():
+    verify_api_token()
 
-    test_pairs = [
-        ('en', 'de', 'Hello', 'English→German'),
-        ('de', 'en', 'Hallo', 'German→English'),
-        ('fr', 'en', 'Bonjour', 'French→English'),
-        ('es', 'en', 'Hola', 'Spanish→English'),
-        ('ru', 'en', 'Привет', 'Russian→English'),
-        ('hi', 'en', 'नमस्ते', 'Hindi→English'),
-        ('zh', 'en', '你好', 'Chinese→English')
-    ]
 
-    try:
-        for src, dst, text, label in test_pairs:
-            if not has_model(src, dst):
-                print(f"   ❌ {label}: has_model() failed")
-                return False
+@pytest.mark.usefixtures("fake_hf_backend")
+def test_german_to_english():
+    verify_german_to_english()
 
-            result = translate_batch([text], src=src, dst=dst)
-            translation = result[0]
 
-            print(f"   ✓ {label}: {text} → {translation}")
+@pytest.mark.usefixtures("fake_hf_backend")
+@pytest.mark.parametrize(
+    "src,dst,text,label", LANGUAGE_PAIRS, ids=[pair[3] for pair in LANGUAGE_PAIRS]
+)
+def test_language_pair(src, dst, text, label):
+    verify_language_pairs([(src, dst, text, label)])
 
-            if len(translation) < 1:
-                print(f"   ❌ Empty translation for {label}")
-                return False
 
-        print("\n✓ PASS: All 7 languages working")
-        return True
+@pytest.mark.parametrize(
+    "text,description", SKIP_CASES, ids=[case[1] for case in SKIP_CASES]
+)
+def test_skip_case(text, description):
+    verify_skip_cases([(text, description)])
 
-    except Exception as e:
-        print(f"❌ FAIL: {e}")
-        return False
 
+class _ThreadBufferedStdout:
+    """stdout proxy that redirects writes to a per-thread buffer when set."""
 
-def test_skip_logic():
-    """Test 4: Skip Logic (empty, punctuation, English)"""
-    print("\n" + "="*60)
-    print("TEST 4: Skip Logic")
-    print("="*60)
+    def __init__(self, stream):
+        self.stream = stream
+        self._local = threading.local()
 
-    test_cases = [
-        ("", "empty string"),
-        ("   ", "whitespace only"),
-        ("•", "punctuation only"),
-        ("This is already English", "English text (ASCII + stopwords)")
-    ]
+    def write(self, text):
+        return getattr(self._local, "buffer", self.stream).write(text)
 
-    try:
-        for text, description in test_cases:
-            result = translate_batch([text], src='de', dst='en')
-            translation = result[0]
+    def flush(self):
+        self.stream.flush()
 
-            # Should return original text unchanged
-            if translation == text:
-                print(f"   ✓ Skipped: {description}")
-            else:
-                print(f"   ❌ Should skip but translated: {description}")
-                print(f"      Original: '{text}'")
-                print(f"      Result:   '{translation}'")
-                return False
+    @contextmanager
+    def capture(self):
+        self._local.buffer = io.StringIO()
+        try:
+            yield self._local.buffer
+        finally:
+            del self._local.buffer
 
-        print("\n✓ PASS: Skip logic working correctly")
-        return True
 
-    except Exception as e:
-        print(f"❌ FAIL: {e}")
-        return False
+def _run_buffered(stdout, name, check):
+    """Run a shared check, returning (passed, captured_output)."""
+    with stdout.capture() as buffer:
+        print("\n" + "="*60)
+        print(f"TEST: {name}")
+        print("="*60)
+        try:
+            check()
+        except AssertionError as e:
+            print(f"❌ FAIL: {e}")
+            passed = False
+        except Exception as e:
+            print(f"\n❌ CRITICAL ERROR in {name}: {e}")
+            passed = False
+        else:
+            print(f"✓ PASS: {name}")
+            passed = True
+    return passed, buffer.getvalue()
 
 
 def main():
@@ -152,20 +157,32 @@ def main():
     print("╚" + "="*58 + "╝")
 
     tests = [
-        ("API Token", test_api_token),
-        ("DE→EN", test_german_to_english),
-        ("All Languages", test_all_languages),
-        ("Skip Logic", test_skip_logic)
+        ("API Token", verify_api_token),
+        ("DE→EN", verify_german_to_english),
+        ("All Languages", lambda: verify_language_pairs(LANGUAGE_PAIRS)),
+        ("Skip Logic", lambda: verify_skip_cases(SKIP_CASES))
     ]
 
-    results = []
-    for name, test_func in tests:
-        try:
-            passed = test_func()
-            results.append((name, passed))
-        except Exception as e:
-            print(f"\n❌ CRITICAL ERROR in {name}: {e}")
-            results.append((name, False))
+    # Tests are I/O-bound on the HF API, so run them side by side and
+    # flush each test's buffered output once it completes.
+    outcomes = {}
+    stdout = _ThreadBufferedStdout(sys.stdout)
+    sys.stdout = stdout
+    try:
+        with ThreadPoolExecutor(max_workers=len(tests)) as executor:
+            futures = {
+                executor.submit(_run_buffered, stdout, name, check): name
+                for name, check in tests
+            }
+            for future in as_completed(futures):
+                name = futures[future]
+                passed, output = future.result()
+                print(output, end="")
+                outcomes[name] = passed
+    finally:
+        sys.stdout = stdout.stream
+
+    results = [(name, outcomes[name]) for name, _ in tests]
 
     # Summary
     print("\n" + "="*60)
@@ -190,4 +207,11 @@ def main():
 
 
 if __name__ == '__main__':
+    # Load environment variables (under pytest, conftest.py does this once)
+    try:
+        from dotenv import load_dotenv
+        load_dotenv()
+    except ImportError:
+        pass
+
     sys.exit(main())
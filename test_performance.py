@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 """Performance benchmark for Qwen2.5-7B translation"""
-import os
+import statistics
 import sys
 import time
 
@@ -11,7 +11,10 @@ try:
 except ImportError:
     pass
 
-from src.translator import translate_batch, has_model
+from src.translator import TranslationContext, has_model, translate_batch
+
+# Measured batches after the warm-up run
+MEASURED_RUNS = 5
 
 
 def benchmark_translation():
@@ -35,21 +38,25 @@ def benchmark_translation():
         "Willkommen bei unserem Service"
     ]
 
-    print(f"\nBenchmarking {len(test_texts)} texts...")
+    print(f"\nBenchmarking {len(test_texts)} texts over {MEASURED_RUNS} runs...")
     print("-" * 60)
 
-    # Measure total time
-    start_time = time.time()
+    # Bypass the translation cache so every run reaches the backend
+    context = TranslationContext.create(cache_enabled=False)
 
     try:
-        translations = translate_batch(test_texts, src='de', dst='en')
+        # Warm-up: absorb model cold start before measuring
+        translate_batch(test_texts[:1], src='de', dst='en', context=context)
+
+        durations = []
+        for _ in range(MEASURED_RUNS):
+            start_time = time.perf_counter()
+            translations = translate_batch(test_texts, src='de', dst='en', context=context)
+            durations.append(time.perf_counter() - start_time)
     except Exception as e:
         print(f"❌ Translation failed: {e}")
         return 1
 
-    end_time = time.time()
-    total_time = end_time - start_time
-
     # Display results
     print("\nResults:")
     print("-" * 60)
@@ -58,13 +65,19 @@ def benchmark_translation():
         print(f"   EN: {translation}")
 
     # Performance metrics
-    avg_time = total_time / len(test_texts)
+    cut_points = statistics.quantiles(durations, n=20, method='inclusive')
+    p50 = statistics.median(durations)
+    p95 = cut_points[18]
+    throughput = len(test_texts) * len(durations) / sum(durations)
+    avg_time = p50 / len(test_texts)
     print("\n" + "="*60)
     print("PERFORMANCE METRICS")
     print("="*60)
-    print(f"Total time:        {total_time:.2f}s")
-    print(f"Texts translated:  {len(test_texts)}")
-    print(f"Average per text:  {avg_time:.2f}s")
+    print(f"Batch p50:         {p50:.2f}s")
+    print(f"Batch p95:         {p95:.2f}s")
+    print(f"Texts per batch:   {len(test_texts)}")
+    print(f"Average per text:  {avg_time:.2f}s (p50)")
+    print(f"Throughput:        {throughput:.2f} texts/s")
 
     # Acceptable threshold: < 3s per text
     if avg_time < 3.0:
@@ -72,7 +85,6 @@ def benchmark_translation():
         return 0
     else:
         print(f"\n⚠ WARNING: Performance slower than expected (> 3s per text)")
-        print("   Note: First API calls may be slower due to model loading")
         return 0  # Still return success, just a warning
 
 
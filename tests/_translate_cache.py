@@ -0,0 +1,57 @@
+"""Process-wide memoization of live translations for the integration tests.
+
+Identical ``(src, dst, text)`` lookups are answered from memory, and misses
+are grouped per language pair so each pair costs a single ``translate_batch``
+call. Persistence across runs is handled by the translator's SQLite cache.
+Backend availability probes are memoized once per pair and active backend,
+so a probe against the fake client never answers for the live one.
+"""
+import functools
+import threading
+from collections import defaultdict
+
+from src import translator
+from src.config import get_backend_name
+from src.translator import has_model, translate_batch
+
+_MEMO: dict[tuple[str, str, str], str] = {}
+_LOCK = threading.Lock()
+
+
+def translate_cached(requests: list[tuple[str, str, str]]) -> list[str]:
+    """Translate ``(src, dst, text)`` triples, preserving input order."""
+    with _LOCK:
+        misses = [key for key in dict.fromkeys(requests) if key not in _MEMO]
+
+    groups: dict[tuple[str, str], list[str]] = defaultdict(list)
+    for src, dst, text in misses:
+        groups[(src, dst)].append(text)
+
+    for (src, dst), texts in groups.items():
+        translations = translate_batch(texts, src=src, dst=dst)
+        with _LOCK:
+            for text, translation in zip(texts, translations):
+                _MEMO[(src, dst, text)] = translation
+
+    return [_MEMO[key] for key in requests]
+
+
+def has_model_cached(src: str, dst: str) -> bool:
+    """Probe the active backend for ``src``→``dst`` once per process."""
+    # The client class tells the fake (fake_hf_backend) and live HfClient apart
+    return _has_model_for(get_backend_name(), translator.HfClient, src, dst)
+
+
+@functools.lru_cache(maxsize=None)
+def _has_model_for(backend: str, client_cls: type, src: str, dst: str) -> bool:
+    return has_model(src, dst)
+
+
+def clear() -> None:
+    """Drop all memoized translations and availability probes.
+
+    conftest's ``fake_hf_backend`` calls this around every faked test.
+    """
+    with _LOCK:
+        _MEMO.clear()
+    _has_model_for.cache_clear()
@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 """Tests for batch processing module"""
+import io
 import json
 import tempfile
 from pathlib import Path
@@ -11,145 +12,283 @@ from lxml import etree
 
 from src.batch import (
     load_sitemap_json, load_sitemap_xml, load_sitemap,
-    process_single_url, run_batch
+    process_single_url, run_batch, RateLimiter
 )
+from src.cache import PageHashCache
 from src.fetcher import FetchError
+from src.writer import map_paths
 
 
-class TestSitemapLoading:
-    """Test sitemap loading functions"""
-    
-    def test_load_sitemap_json_valid(self, tmp_path):
-        """Test loading valid JSON sitemap"""
-        sitemap_path = tmp_path / "sitemap.json"
-        data = [
+@pytest.fixture(scope='module')
+def sitemap_file_factory(tmp_path_factory):
+    """Write each distinct sitemap payload once per module and return its path."""
+    base = tmp_path_factory.mktemp("sitemaps")
+    written: dict[tuple[str, str], Path] = {}
+
+    def make(content: str, name: str = "sitemap.xml") -> Path:
+        key = (name, content)
+        if key not in written:
+            directory = base / str(len(written))
+            directory.mkdir()
+            path = directory / name
+            path.write_text(content, encoding='utf-8')
+            written[key] = path
+        return written[key]
+
+    return make
+
+
+NS_URLSET = '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+
+# (id, loader, filename or None for in-memory, content, expected URLs)
+SITEMAP_CASES = [
+    (
+        "json_valid", load_sitemap_json, None,
+        json.dumps([
             {"url": "https://www.landsiedel.com/de/page1.html"},
             {"url": "https://www.landsiedel.com/de/page2.html"},
             {"url": "https://www.landsiedel.com/en/page3.html"},  # Should filter out
             {"url": "https://example.com/de/page4.html"},  # Wrong domain
-        ]
-        sitemap_path.write_text(json.dumps(data), encoding='utf-8')
-        
-        urls = load_sitemap_json(str(sitemap_path))
-        
-        assert len(urls) == 2
-        assert all('/de/' in url for url in urls)
-        assert all('www.landsiedel.com' in url for url in urls)
-    
-    def test_load_sitemap_json_with_loc_field(self, tmp_path):
-        """Test JSON with 'loc' field instead of 'url'"""
-        sitemap_path = tmp_path / "sitemap.json"
-        data = [
-            {"loc": "https://www.landsiedel.com/de/test.html"},
-        ]
-        sitemap_path.write_text(json.dumps(data), encoding='utf-8')
-        
-        urls = load_sitemap_json(str(sitemap_path))
-        
-        assert len(urls) == 1
-        assert urls[0] == "https://www.landsiedel.com/de/test.html"
-    
-    def test_load_sitemap_json_deduplication(self, tmp_path):
-        """Test that duplicate URLs are deduplicated"""
-        sitemap_path = tmp_path / "sitemap.json"
-        data = [
+        ]),
+        ["https://www.landsiedel.com/de/page1.html",
+         "https://www.landsiedel.com/de/page2.html"],
+    ),
+    (
+        "json_loc_field", load_sitemap_json, "sitemap.json",
+        json.dumps([{"loc": "https://www.landsiedel.com/de/test.html"}]),
+        ["https://www.landsiedel.com/de/test.html"],
+    ),
+    (
+        "json_deduplication", load_sitemap_json, None,
+        json.dumps([
             {"url": "https://www.landsiedel.com/de/page.html"},
             {"url": "https://www.landsiedel.com/de/page.html"},  # Duplicate
+        ]),
+        ["https://www.landsiedel.com/de/page.html"],
+    ),
+    (
+        "json_filter_edge_cases", load_sitemap_json, None,
+        json.dumps([
+            {"url": "https://www.landsiedel.com/seminare/de/kurs.html"},
+            {"url": "https://www.landsiedel.com/de?x=/de/"},  # /de/ only in query
+            {"url": "https://www.landsiedel.com.evil.test/de/page.html"},
+            {"url": "http://www.landsiedel.com/de/"},
+        ]),
+        ["http://www.landsiedel.com/de/",
+         "https://www.landsiedel.com/seminare/de/kurs.html"],
+    ),
+    (
+        "xml_valid", load_sitemap_xml, None,
+        f"""<?xml version="1.0" encoding="UTF-8"?>
+{NS_URLSET}
+  <url><loc>https://www.landsiedel.com/de/page1.html</loc></url>
+  <url><loc>https://www.landsiedel.com/de/page2.html</loc></url>
+  <url><loc>https://www.landsiedel.com/en/page3.html</loc></url>
+</urlset>""",
+        ["https://www.landsiedel.com/de/page1.html",
+         "https://www.landsiedel.com/de/page2.html"],
+    ),
+    (
+        "xml_without_namespace", load_sitemap_xml, "sitemap.xml",
+        """<?xml version="1.0" encoding="UTF-8"?>
+<urlset>
+  <url><loc>https://www.landsiedel.com/de/test.html</loc></url>
+</urlset>""",
+        ["https://www.landsiedel.com/de/test.html"],
+    ),
+    (
+        "xml_namespaced_locs_take_precedence", load_sitemap_xml, None,
+        f"""<?xml version="1.0" encoding="UTF-8"?>
+{NS_URLSET}
+  <url><loc>https://www.landsiedel.com/en/page.html</loc></url>
+  <loc xmlns="">https://www.landsiedel.com/de/stray.html</loc>
+</urlset>""",
+        [],
+    ),
+    (
+        "xml_loc_under_root_after_prolog_comment", load_sitemap_xml, None,
+        """<?xml version="1.0"?><!-- c --><urlset><loc>https://www.landsiedel.com/de/a</loc></urlset>""",
+        ["https://www.landsiedel.com/de/a"],
+    ),
+    (
+        "auto_detect_json", load_sitemap, "sitemap.json",
+        json.dumps([{"url": "https://www.landsiedel.com/de/page.html"}]),
+        ["https://www.landsiedel.com/de/page.html"],
+    ),
+    (
+        "auto_detect_xml", load_sitemap, "sitemap.xml",
+        f"""<?xml version="1.0" encoding="UTF-8"?>
+{NS_URLSET}<url><loc>https://www.landsiedel.com/de/test.html</loc></url></urlset>""",
+        ["https://www.landsiedel.com/de/test.html"],
+    ),
+    (
+        "fallback_json_to_xml", load_sitemap, "sitemap",
+        f"""<?xml version="1.0" encoding="UTF-8"?>
+{NS_URLSET}<url><loc>https://www.landsiedel.com/de/test.html</loc></url></urlset>""",
+        ["https://www.landsiedel.com/de/test.html"],
+    ),
+]
+
+
+@pytest.fixture
+def sitemap_source(request, sitemap_file_factory):
+    """Materialize a (filename, content) param as a path or in-memory stream."""
+    name, content = request.param
+    if name is None:
+        return io.BytesIO(content.encode('utf-8'))
+    return str(sitemap_file_factory(content, name=name))
+
+
+class TestSitemapLoading:
+    """Test sitemap loading functions"""
+
+    @pytest.mark.parametrize(
+        "loader, sitemap_source, expected",
+        [(loader, (name, content), expected)
+         for _, loader, name, content, expected in SITEMAP_CASES],
+        ids=[case[0] for case in SITEMAP_CASES],
+        indirect=["sitemap_source"],
+    )
+    def test_load_sitemap(self, loader, sitemap_source, expected):
+        """Loaders keep only unique /de/ URLs from www.landsiedel.com"""
+        assert loader(sitemap_source) == expected
+
+    def test_load_sitemap_json_text_stream(self):
+        """Text-mode streams are accepted as well as binary ones"""
+        data = [{"url": "https://www.landsiedel.com/de/page.html"}]
+
+        urls = load_sitemap_json(io.StringIO(json.dumps(data)))
+
+        assert urls == ["https://www.landsiedel.com/de/page.html"]
+
+    @pytest.mark.parametrize("use_orjson", [True, False], ids=["orjson", "stdlib"])
+    def test_load_sitemap_json_without_ijson(self, monkeypatch, use_orjson):
+        """Whole-document fallback decodes with orjson or the stdlib json module"""
+        from src import batch
+        monkeypatch.setattr(batch, 'ijson', None)
+        if not use_orjson:
+            monkeypatch.setattr(batch, 'orjson', None)
+        elif batch.orjson is None:
+            pytest.skip("orjson not installed")
+
+        payload = json.dumps([
+            {"url": "https://www.landsiedel.com/de/b.html"},
+            {"loc": "https://www.landsiedel.com/de/a.html"},
+        ]).encode('utf-8')
+
+        assert load_sitemap_json(io.BytesIO(payload)) == [
+            "https://www.landsiedel.com/de/a.html",
+            "https://www.landsiedel.com/de/b.html",
         ]
-        sitemap_path.write_text(json.dumps(data), encoding='utf-8')
-        
-        urls = load_sitemap_json(str(sitemap_path))
-        
-        assert len(urls) == 1
-    
-    def test_load_sitemap_json_invalid_format(self, tmp_path):
+        with pytest.raises(ValueError):
+            load_sitemap_json(io.BytesIO(b"[{"))
+
+    def test_load_sitemap_json_deduplication_scales_linearly(self, monkeypatch):
+        """Regression: deduplicating a 10k-entry sitemap stays hash-based"""
+        from src import batch
+
+        eq_calls = 0
+
+        class CountingUrl(str):
+            __hash__ = str.__hash__
+
+            def __eq__(self, other):
+                nonlocal eq_calls
+                eq_calls += 1
+                return str.__eq__(self, other)
+
+        entries = [
+            {"url": CountingUrl(f"https://www.landsiedel.com/de/page{i % 5_000}.html")}
+            for i in range(10_000)
+        ]
+        monkeypatch.setattr(batch, '_iter_json_entries', lambda fh: iter(entries))
+
+        urls = load_sitemap_json(b"[]")
+
+        assert len(urls) == 5_000
+        assert len(set(urls)) == len(urls)
+        # A set lookup compares a duplicate about once; a list scan would
+        # need ~2.5 * 10^7 comparisons here
+        assert eq_calls <= len(entries)
+
+    def test_load_sitemap_json_invalid_format(self):
         """Test error handling for invalid JSON format"""
-        sitemap_path = tmp_path / "sitemap.json"
-        sitemap_path.write_text("{}", encoding='utf-8')  # Not an array
-        
         with pytest.raises(ValueError, match="must contain an array"):
-            load_sitemap_json(str(sitemap_path))
-    
-    def test_load_sitemap_xml_valid(self, tmp_path):
-        """Test loading valid XML sitemap"""
-        sitemap_path = tmp_path / "sitemap.xml"
-        xml_content = """<?xml version="1.0" encoding="UTF-8"?>
-<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
-  <url>
-    <loc>https://www.landsiedel.com/de/page1.html</loc>
-  </url>
-  <url>
-    <loc>https://www.landsiedel.com/de/page2.html</loc>
-  </url>
-  <url>
-    <loc>https://www.landsiedel.com/en/page3.html</loc>
-  </url>
-</urlset>"""
-        sitemap_path.write_text(xml_content, encoding='utf-8')
-        
-        urls = load_sitemap_xml(str(sitemap_path))
-        
-        assert len(urls) == 2
-        assert all('/de/' in url for url in urls)
-        assert all('www.landsiedel.com' in url for url in urls)
-    
-    def test_load_sitemap_xml_without_namespace(self, tmp_path):
-        """Test XML sitemap without namespace"""
+            load_sitemap_json(io.BytesIO(b"{}"))  # Not an array
+
+    def test_load_sitemap_json_streams_large_file(self, tmp_path):
+        """Large JSON sitemaps are streamed: peak memory does not grow with size"""
+        pytest.importorskip('ijson')
+        import tracemalloc
+
+        def write_sitemap(name, entries):
+            sitemap_path = tmp_path / name
+            with open(sitemap_path, 'w', encoding='utf-8') as f:
+                f.write('[')
+                for i in range(entries):
+                    if i:
+                        f.write(',')
+                    lang = 'de' if i % 2 else 'en'
+                    json.dump({"url": f"https://www.landsiedel.com/{lang}/page{i % 50}.html",
+                               "lastmod": "2024-01-01", "padding": "x" * 64}, f)
+                f.write(']')
+            return sitemap_path
+
+        def peak_while_loading(sitemap_path):
+            tracemalloc.start()
+            try:
+                urls = load_sitemap_json(sitemap_path)
+                _, peak = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+            assert len(urls) == 25
+            assert all('/de/' in url for url in urls)
+            return peak
+
+        small_peak = peak_while_loading(write_sitemap("small.json", 5_000))
+        large_peak = peak_while_loading(write_sitemap("large.json", 50_000))
+
+        # Loading the whole document would scale the peak ~10x with the input;
+        # measured against the same run, so allocator differences cancel out
+        assert large_peak < 2 * small_peak
+
+    def test_load_sitemap_xml_streams_large_file(self, tmp_path, monkeypatch):
+        """Processed <url> elements are cleared and pruned while stream-parsing"""
+        from src import batch
+
         sitemap_path = tmp_path / "sitemap.xml"
-        xml_content = """<?xml version="1.0" encoding="UTF-8"?>
-<urlset>
-  <url>
-    <loc>https://www.landsiedel.com/de/test.html</loc>
-  </url>
-</urlset>"""
-        sitemap_path.write_text(xml_content, encoding='utf-8')
-        
+        with open(sitemap_path, 'w', encoding='utf-8') as f:
+            f.write(f'<?xml version="1.0" encoding="UTF-8"?>\n{NS_URLSET}\n')
+            for i in range(50_000):
+                lang = 'de' if i % 2 else 'en'
+                f.write(f"<url><loc>https://www.landsiedel.com/{lang}/page{i % 50}.html</loc>"
+                        "<lastmod>2024-01-01</lastmod></url>\n")
+            f.write('</urlset>\n')
+
+        # Keep a handle on the parser so the partial tree can be inspected
+        contexts = []
+        real_iterparse = batch.etree.iterparse
+
+        def recording_iterparse(*args, **kwargs):
+            context = real_iterparse(*args, **kwargs)
+            contexts.append(context)
+            return context
+
+        monkeypatch.setattr(batch.etree, 'iterparse', recording_iterparse)
+
         urls = load_sitemap_xml(str(sitemap_path))
-        
-        assert len(urls) == 1
-        assert urls[0] == "https://www.landsiedel.com/de/test.html"
-    
-    def test_load_sitemap_auto_detect_json(self, tmp_path):
-        """Test auto-detection for .json extension"""
-        sitemap_path = tmp_path / "sitemap.json"
-        data = [{"url": "https://www.landsiedel.com/de/page.html"}]
-        sitemap_path.write_text(json.dumps(data), encoding='utf-8')
-        
-        urls = load_sitemap(str(sitemap_path))
-        
-        assert len(urls) == 1
-    
-    def test_load_sitemap_auto_detect_xml(self, tmp_path):
-        """Test auto-detection for .xml extension"""
-        sitemap_path = tmp_path / "sitemap.xml"
-        xml_content = """<?xml version="1.0" encoding="UTF-8"?>
-<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
-  <url><loc>https://www.landsiedel.com/de/test.html</loc></url>
-</urlset>"""
-        sitemap_path.write_text(xml_content, encoding='utf-8')
-        
-        urls = load_sitemap(str(sitemap_path))
-        
-        assert len(urls) == 1
-    
-    def test_load_sitemap_fallback_json_to_xml(self, tmp_path):
-        """Test fallback from JSON to XML when no extension"""
-        sitemap_path = tmp_path / "sitemap"
-        xml_content = """<?xml version="1.0" encoding="UTF-8"?>
-<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
-  <url><loc>https://www.landsiedel.com/de/test.html</loc></url>
-</urlset>"""
-        sitemap_path.write_text(xml_content, encoding='utf-8')
-        
-        urls = load_sitemap(str(sitemap_path))
-        
-        assert len(urls) == 1
-    
+
+        assert len(urls) == 25
+        root = contexts[0].root
+        # Only the last <url> survives, and its <loc> text was cleared
+        assert len(root) == 1
+        assert root[0][0].text is None
+
     def test_load_sitemap_file_not_found(self):
         """Test error when sitemap file doesn't exist"""
         with pytest.raises(FileNotFoundError):
             load_sitemap("/nonexistent/sitemap.json")
-    
+
     def test_load_sitemap_invalid_format(self, tmp_path):
         """Test error when file is neither valid JSON nor XML"""
         sitemap_path = tmp_path / "sitemap.txt"
@@ -159,200 +298,183 @@ class TestSitemapLoading:
             load_sitemap(str(sitemap_path))
 
 
+PAGE_URL = 'https://www.landsiedel.com/de/test.html'
+BATCH_URLS = [
+    'https://www.landsiedel.com/de/page1.html',
+    'https://www.landsiedel.com/de/page2.html',
+]
+
+
+def _outcomes_by_url(outcomes: dict):
+    """side_effect for a mocked process_single_url keyed by URL, so the
+    result does not depend on which worker thread calls first."""
+    def process(url, *args, **kwargs):
+        outcome = outcomes.get(url)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+    return process
+
+
 class TestProcessSingleUrl:
     """Test single URL processing"""
-    
-    @patch('src.batch.fetch')
-    @patch('src.batch.parse')
-    @patch('src.batch.preview_batch')
-    @patch('src.batch.translate_batch')
-    @patch('src.batch.save_html')
-    def test_process_single_url_success(
-        self,
-        mock_save,
-        mock_translate,
-        mock_preview,
-        mock_parse,
-        mock_fetch,
-        tmp_path
-    ):
+
+    MOCK_HTML = "<html><body>Test</body></html>"
+
+    @pytest.fixture(autouse=True)
+    def pipeline(self, monkeypatch):
+        """Replace every pipeline stage with a mock; tests adjust as needed."""
+        self.fetch = Mock(return_value=(self.MOCK_HTML, {'final_url': PAGE_URL}))
+        self.parse = Mock(return_value=(MagicMock(), ["Text 1"]))
+        self.preview = Mock(return_value=SimpleNamespace(total=1, cache_hits=0, pending=[]))
+        self.translate = Mock(return_value=["Text 1 translated"])
+        self.save = Mock()
+
+        monkeypatch.setattr('src.batch.fetch', self.fetch)
+        monkeypatch.setattr('src.batch.parse', self.parse)
+        monkeypatch.setattr('src.batch.preview_batch', self.preview)
+        monkeypatch.setattr('src.batch.translate_batch', self.translate)
+        monkeypatch.setattr('src.batch.save_html', self.save)
+
+    def test_process_single_url_success(self, tmp_path):
         """Test successful processing of single URL"""
-        # Mock fetch
-        mock_html = "<html><body>Test</body></html>"
-        mock_fetch.return_value = (
-            mock_html,
-            {'final_url': 'https://www.landsiedel.com/de/test.html'}
-        )
-        
-        # Mock parse
-        mock_soup = MagicMock()
-        mock_items = ["Text 1"]
-        mock_parse.return_value = (mock_soup, mock_items)
-        
-        # Mock preview (should not be used in normal mode)
-        mock_preview.return_value = SimpleNamespace(total=1, cache_hits=0, pending=[])
+        process_single_url(PAGE_URL, str(tmp_path))
 
-        # Mock translate
-        mock_translate.return_value = ["Text 1 translated"]
-        
-        # Process
-        process_single_url(
-            'https://www.landsiedel.com/de/test.html',
-            str(tmp_path)
-        )
-        
-        # Verify calls
-        assert mock_fetch.called
-        mock_preview.assert_not_called()
-        assert mock_parse.call_count == 2  # Once for EN, once for DE
-        assert mock_translate.called
-        assert mock_save.call_count == 2  # DE + EN
-
-    @patch('src.batch.translate_batch')
-    @patch('src.batch.preview_batch')
-    @patch('src.batch.parse')
-    @patch('src.batch.fetch')
-    def test_process_single_url_dry_run(
-        self,
-        mock_fetch,
-        mock_parse,
-        mock_preview,
-        mock_translate,
-        tmp_path
-    ):
-        """Dry-run should plan translations without invoking translate_batch."""
+        assert self.fetch.called
+        self.preview.assert_not_called()
+        self.parse.assert_called_once_with(self.MOCK_HTML)  # DE is saved from raw HTML
+        assert self.translate.called
+        self.save.assert_called_once()  # EN only
 
-        mock_html = "<html><body>Hallo</body></html>"
-        mock_fetch.return_value = (
-            mock_html,
-            {'final_url': 'https://www.landsiedel.com/de/test.html'}
-        )
+        de_path, _ = map_paths(PAGE_URL, str(tmp_path))
+        assert Path(de_path).read_text(encoding='utf-8') == self.MOCK_HTML
+
+    def test_process_single_url_skips_unchanged_page(self, tmp_path):
+        """Pages whose HTML hash matches the last run are not reprocessed"""
+        for path in map_paths(PAGE_URL, str(tmp_path)):
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            Path(path).write_text(self.MOCK_HTML, encoding='utf-8')
+
+        with PageHashCache(str(tmp_path / 'pages.db')) as page_cache:
+            page_cache.set(PAGE_URL, PageHashCache.hash_content(self.MOCK_HTML), 'en.html')
 
-        mock_parse.return_value = (MagicMock(), ["Hallo"])
+            summary = process_single_url(PAGE_URL, str(tmp_path), page_cache=page_cache)
 
-        mock_preview.return_value = SimpleNamespace(
+            assert summary == {'url': PAGE_URL, 'unchanged': True}
+            self.parse.assert_not_called()
+
+            self.fetch.return_value = (self.MOCK_HTML.replace('Test', 'Neu'), {'final_url': PAGE_URL})
+            self.parse.side_effect = RuntimeError("parsed")
+
+            with pytest.raises(RuntimeError, match="parsed"):
+                process_single_url(PAGE_URL, str(tmp_path), page_cache=page_cache)
+
+    def test_process_single_url_dry_run(self, tmp_path):
+        """Dry-run should plan translations without invoking translate_batch."""
+        self.parse.return_value = (MagicMock(), ["Hallo"])
+        self.preview.return_value = SimpleNamespace(
             total=1,
             cache_hits=0,
             pending=[SimpleNamespace(index=0, original="Hallo")]
         )
 
-        summary = process_single_url(
-            'https://www.landsiedel.com/de/test.html',
-            str(tmp_path),
-            dry_run=True
-        )
+        summary = process_single_url(PAGE_URL, str(tmp_path), dry_run=True)
 
         assert summary == {
-            'url': 'https://www.landsiedel.com/de/test.html',
+            'url': PAGE_URL,
             'total_texts': 1,
             'cache_hits': 0,
             'pending_translations': 1
         }
-        mock_preview.assert_called_once()
-        mock_translate.assert_not_called()
-        assert mock_parse.call_count == 1
+        self.preview.assert_called_once()
+        self.translate.assert_not_called()
+        assert self.parse.call_count == 1
 
-    @patch('src.batch.fetch')
-    def test_process_single_url_fetch_error(self, mock_fetch, tmp_path):
+    def test_process_single_url_fetch_error(self, tmp_path):
         """Test that FetchError is propagated"""
-        mock_fetch.side_effect = FetchError("Connection failed")
-        
+        self.fetch.side_effect = FetchError("Connection failed")
+
         with pytest.raises(FetchError):
-            process_single_url(
-                'https://www.landsiedel.com/de/test.html',
-                str(tmp_path)
-            )
+            process_single_url(PAGE_URL, str(tmp_path))
 
 
 class TestRunBatch:
     """Test batch orchestrator"""
-    
-    @patch('src.batch.process_single_url')
-    @patch('src.batch.time.sleep')
-    def test_run_batch_all_success(self, mock_sleep, mock_process, tmp_path):
+
+    @pytest.fixture(autouse=True)
+    def worker(self, monkeypatch):
+        """Stub out per-URL processing and sleeping for every test."""
+        self.process = Mock(return_value=None)
+        self.sleep = Mock()
+        monkeypatch.setattr('src.batch.process_single_url', self.process)
+        monkeypatch.setattr('src.batch.time.sleep', self.sleep)
+
+    def test_run_batch_all_success(self, tmp_path):
         """Test batch with all URLs successful"""
-        urls = [
-            'https://www.landsiedel.com/de/page1.html',
-            'https://www.landsiedel.com/de/page2.html',
-        ]
-        
-        results = run_batch(urls, str(tmp_path), delay=0.1)
-        
+        results = run_batch(BATCH_URLS, str(tmp_path), delay=0.1)
+
         assert results['success'] == 2
         assert results['failed'] == 0
         assert results['skipped'] == 0
         assert len(results['failed_urls']) == 0
-        assert mock_sleep.call_count == 1  # Only between URLs, not after last
-    
-    @patch('src.batch.process_single_url')
-    @patch('src.batch.time.sleep')
-    def test_run_batch_with_fetch_errors(self, mock_sleep, mock_process, tmp_path):
+        assert self.sleep.call_count == 1  # Only between URLs, not after last
+
+    def test_run_batch_with_fetch_errors(self, tmp_path):
         """Test batch with FetchError (should skip, not fail)"""
-        urls = [
-            'https://www.landsiedel.com/de/page1.html',
-            'https://www.landsiedel.com/de/page2.html',
-        ]
-        
-        # First URL succeeds, second raises FetchError
-        mock_process.side_effect = [None, FetchError("Timeout")]
-        
-        results = run_batch(urls, str(tmp_path), delay=0.1)
-        
+        self.process.side_effect = _outcomes_by_url({BATCH_URLS[1]: FetchError("Timeout")})
+
+        results = run_batch(BATCH_URLS, str(tmp_path), delay=0.1)
+
         assert results['success'] == 1
         assert results['failed'] == 0
         assert results['skipped'] == 1
         assert len(results['failed_urls']) == 0
-    
-    @patch('src.batch.process_single_url')
-    @patch('src.batch.time.sleep')
-    def test_run_batch_with_exceptions(self, mock_sleep, mock_process, tmp_path):
+
+    def test_run_batch_with_exceptions(self, tmp_path):
         """Test batch with generic exceptions (should fail)"""
-        urls = [
-            'https://www.landsiedel.com/de/page1.html',
-            'https://www.landsiedel.com/de/page2.html',
-        ]
-        
-        # First URL succeeds, second raises Exception
-        mock_process.side_effect = [None, ValueError("Parse error")]
-        
-        results = run_batch(urls, str(tmp_path), delay=0.1)
-        
+        self.process.side_effect = _outcomes_by_url({BATCH_URLS[1]: ValueError("Parse error")})
+
+        results = run_batch(BATCH_URLS, str(tmp_path), delay=0.1)
+
         assert results['success'] == 1
         assert results['failed'] == 1
         assert results['skipped'] == 0
         assert len(results['failed_urls']) == 1
-        
+
         # Check failed_urls.txt was created
         failed_file = Path(tmp_path) / 'failed_urls.txt'
         assert failed_file.exists()
         content = failed_file.read_text()
         assert 'page2.html' in content
         assert 'Parse error' in content
-    
-    @patch('src.batch.process_single_url')
-    @patch('src.batch.time.sleep')
-    def test_run_batch_no_delay_after_last_url(self, mock_sleep, mock_process, tmp_path):
+
+    def test_run_batch_no_delay_after_last_url(self, tmp_path):
         """Test that delay is not applied after the last URL"""
-        urls = ['https://www.landsiedel.com/de/page.html']
+        run_batch(['https://www.landsiedel.com/de/page.html'], str(tmp_path), delay=1.0)
 
-        run_batch(urls, str(tmp_path), delay=1.0)
+        assert not self.sleep.called  # No sleep for single URL
 
-        assert not mock_sleep.called  # No sleep for single URL
+    def test_run_batch_counts_unchanged_pages_as_skipped(self, tmp_path):
+        self.process.side_effect = _outcomes_by_url(
+            {BATCH_URLS[0]: {'url': BATCH_URLS[0], 'unchanged': True}}
+        )
 
-    @patch('src.batch.process_single_url')
-    @patch('src.batch.time.sleep')
-    def test_run_batch_dry_run_collects_stats(self, mock_sleep, mock_process, tmp_path):
-        urls = [
-            'https://www.landsiedel.com/de/page1.html',
-            'https://www.landsiedel.com/de/page2.html',
-        ]
+        results = run_batch(
+            BATCH_URLS, str(tmp_path), delay=0.0, page_cache_path=str(tmp_path / 'pages.db')
+        )
 
-        mock_process.side_effect = [
-            {'url': urls[0], 'total_texts': 3, 'cache_hits': 1, 'pending_translations': 2},
-            {'url': urls[1], 'total_texts': 2, 'cache_hits': 0, 'pending_translations': 2},
-        ]
+        assert results['success'] == 1
+        assert results['skipped'] == 1
+        assert results['failed'] == 0
+        assert self.process.call_args_list[0].kwargs['page_cache'] is not None
+
+    def test_run_batch_dry_run_collects_stats(self, tmp_path):
+        self.process.side_effect = _outcomes_by_url({
+            BATCH_URLS[0]: {'url': BATCH_URLS[0], 'total_texts': 3, 'cache_hits': 1, 'pending_translations': 2},
+            BATCH_URLS[1]: {'url': BATCH_URLS[1], 'total_texts': 2, 'cache_hits': 0, 'pending_translations': 2},
+        })
 
-        results = run_batch(urls, str(tmp_path), delay=0.0, dry_run=True)
+        results = run_batch(BATCH_URLS, str(tmp_path), delay=0.0, dry_run=True)
 
         assert results['success'] == 2
         assert results['failed'] == 0
@@ -363,4 +485,29 @@ class TestRunBatch:
             'cache_hits': 1,
             'pending_translations': 4
         }
-        assert mock_process.call_args_list[0].kwargs['dry_run'] is True
+        assert self.process.call_args_list[0].kwargs['dry_run'] is True
+
+
+class TestRateLimiter:
+    """Test request spacing shared by batch workers"""
+
+    @patch('src.batch.time.sleep')
+    def test_min_interval_spaces_request_starts(self, mock_sleep):
+        limiter = RateLimiter(max_requests=10, time_window=1.0, min_interval=0.5)
+
+        for _ in range(3):
+            limiter.wait_if_needed()
+
+        waits = [c.args[0] for c in mock_sleep.call_args_list]
+        assert len(waits) == 2  # First request starts immediately
+        assert waits[0] == pytest.approx(0.5, abs=0.05)
+        assert waits[1] == pytest.approx(1.0, abs=0.05)
+
+    @patch('src.batch.time.sleep')
+    def test_zero_interval_never_sleeps_below_window(self, mock_sleep):
+        limiter = RateLimiter(max_requests=5, time_window=1.0)
+
+        for _ in range(5):
+            limiter.wait_if_needed()
+
+        assert not mock_sleep.called
@@ -1,6 +1,6 @@
 """Unit tests for the SQLite-backed translation cache."""
 
-from src.cache import TranslationCache
+from src.cache import PageHashCache, TranslationCache
 
 
 def test_cache_set_and_get_many(tmp_path):
@@ -36,3 +36,36 @@ def test_cache_clear_removes_entries(tmp_path):
     result = cache.get_many(['Hallo'], src='de', dst='en', model='test-model')
 
     assert result['Hallo'] is None
+
+
+def test_cache_get_many_handles_more_keys_than_sqlite_variables(tmp_path):
+    cache_path = tmp_path / "cache.db"
+    cache = TranslationCache(str(cache_path))
+
+    data = {f'Satz {i}': f'Sentence {i}' for i in range(2500)}
+    cache.set_many(data, src='de', dst='en', model='test-model')
+
+    result = cache.get_many(list(data) + ['Unbekannt'], src='de', dst='en', model='test-model')
+
+    assert all(result[text] == translation for text, translation in data.items())
+    assert result['Unbekannt'] is None
+
+
+def test_cache_uses_wal_journal(tmp_path):
+    cache = TranslationCache(str(tmp_path / "cache.db"))
+
+    mode = cache.conn.execute("PRAGMA journal_mode").fetchone()[0]
+
+    assert mode == 'wal'
+
+
+def test_page_hash_cache_round_trip(tmp_path):
+    with PageHashCache(str(tmp_path / "pages.db")) as cache:
+        digest = PageHashCache.hash_content("<html>Hallo</html>")
+
+        assert cache.get('https://www.landsiedel.com/de/a.html') is None
+
+        cache.set('https://www.landsiedel.com/de/a.html', digest, 'output/en/a.html')
+
+        assert cache.get('https://www.landsiedel.com/de/a.html') == digest
+        assert digest != PageHashCache.hash_content("<html>Hallo!</html>")
@@ -5,6 +5,16 @@ import httpx
 from src.fetcher import fetch, FetchError
 
 
+@pytest.fixture(autouse=True)
+def offline_fetcher(monkeypatch):
+    """Keep the module offline: resolve every host to a public IP, skip backoff."""
+    monkeypatch.setattr(
+        'src.fetcher.socket.getaddrinfo',
+        lambda host, port, *args, **kwargs: [(None, None, None, '', ('93.184.216.34', 0))],
+    )
+    monkeypatch.setattr('src.fetcher.time.sleep', lambda seconds: None)
+
+
 def test_fetch_success_html():
     """Successfully fetch HTML content with metadata"""
     mock_response = Mock()
@@ -89,3 +99,20 @@ def test_encoding_fallback():
         html, meta = fetch('https://example.com/page')
 
     assert meta['encoding'] == 'utf-8'
+
+
+def test_get_client_is_shared_across_threads(monkeypatch):
+    """Concurrent batch workers reuse one pooled client"""
+    from concurrent.futures import ThreadPoolExecutor
+    from src import fetcher
+
+    monkeypatch.setattr(fetcher, '_client', None)
+    monkeypatch.setattr(fetcher.atexit, 'register', lambda func: func)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        clients = list(pool.map(lambda _: fetcher._get_client(), range(16)))
+
+    try:
+        assert all(client is clients[0] for client in clients)
+    finally:
+        clients[0].close()
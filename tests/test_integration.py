@@ -2,7 +2,6 @@
 import pytest
 from pathlib import Path
 from unittest.mock import Mock, patch
-from src.translator import has_model
 from src.parser import parse
 from src.translator import translate_batch
 from src.writer import apply_translations, rewrite_links, set_lang
@@ -11,18 +10,17 @@ from src.writer import apply_translations, rewrite_links, set_lang
 FIXTURE_PATH = Path(__file__).parent / 'fixtures' / 'sample_de.html'
 
 
-@pytest.mark.skipif(
-    not has_model('de', 'en'),
-    reason="HF translation backend unavailable"
-)
-def test_end_to_end_with_real_hf():
-    """Full pipeline with real Hugging Face translation backend."""
-    # Load fixture
-    with open(FIXTURE_PATH, 'r', encoding='utf-8') as f:
-        html = f.read()
+@pytest.fixture(scope='module')
+def fixture_html():
+    """Read the sample page once; each test parses its own mutable soup."""
+    return FIXTURE_PATH.read_text(encoding='utf-8')
 
+
+@pytest.mark.usefixtures("fake_hf_backend")
+def test_end_to_end_with_real_hf(fixture_html):
+    """Full pipeline through translate_batch (live HF with --run-integration)."""
     # Parse
-    soup, items = parse(html)
+    soup, items = parse(fixture_html)
 
     # Extract translatable texts (text nodes + attrs)
     texts_to_translate = []
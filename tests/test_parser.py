@@ -8,18 +8,21 @@ from src.parser import parse
 FIXTURE_PATH = Path(__file__).parent / 'fixtures' / 'sample_de.html'
 
 
-def test_extracts_visible_texts():
-    """Extracts text from allowed tags"""
-    with open(FIXTURE_PATH, 'r', encoding='utf-8') as f:
-        html = f.read()
+@pytest.fixture(scope='module')
+def parsed_fixture():
+    """Read and parse the sample page once; tests below only inspect it."""
+    return parse(FIXTURE_PATH.read_text(encoding='utf-8'))
+
 
-    soup, items = parse(html)
+def test_extracts_visible_texts(parsed_fixture):
+    """Extracts text from allowed tags"""
+    soup, items = parsed_fixture
 
     # Collect text items
-    texts = [
+    texts = {
         item.strip() for item in items
         if isinstance(item, NavigableString)
-    ]
+    }
 
     assert 'Willkommen' in texts
     assert 'Dies ist ein' in texts  # p tag content (partial)
@@ -30,12 +33,9 @@ def test_extracts_visible_texts():
     assert 'Ein Zitat über Technologie.' in texts  # blockquote
 
 
-def test_collects_attributes():
+def test_collects_attributes(parsed_fixture):
     """Collects alt, title, and meta content attributes"""
-    with open(FIXTURE_PATH, 'r', encoding='utf-8') as f:
-        html = f.read()
-
-    soup, items = parse(html)
+    soup, items = parsed_fixture
 
     # Collect attribute items (tag, attr_name) tuples
     attr_items = [
@@ -67,12 +67,9 @@ def test_collects_attributes():
     assert len(meta_desc) > 0
 
 
-def test_excludes_non_textual_nodes():
+def test_excludes_non_textual_nodes(parsed_fixture):
     """Excludes text from script, style, code, pre, noscript"""
-    with open(FIXTURE_PATH, 'r', encoding='utf-8') as f:
-        html = f.read()
-
-    soup, items = parse(html)
+    soup, items = parsed_fixture
 
     texts = [
         str(item) for item in items
@@ -86,12 +83,9 @@ def test_excludes_non_textual_nodes():
     assert "JavaScript erforderlich" not in ' '.join(texts)
 
 
-def test_preserves_dom_shape():
+def test_preserves_dom_shape(parsed_fixture):
     """Parsing doesn't modify DOM structure"""
-    with open(FIXTURE_PATH, 'r', encoding='utf-8') as f:
-        html = f.read()
-
-    soup, items = parse(html)
+    soup, items = parsed_fixture
 
     # Check basic structure still intact
     assert soup.h1 is not None
@@ -1,29 +1,61 @@
 """Tests for path traversal vulnerability prevention in writer.map_paths()"""
+import os
+import re
+
 import pytest
-from pathlib import Path
-from src.writer import map_paths
+from src.writer import map_paths, output_tree_has_symlinks
 
+# Error-message patterns, compiled once for pytest.raises(match=...)
+_M_TRAVERSAL = re.compile("Path traversal detected")
+_M_UNSAFE = re.compile("unsafe characters|Invalid path")
 
-def test_blocks_parent_directory_traversal(tmp_path):
-    """Block ../../../ traversal attempts"""
-    output_dir = str(tmp_path)
 
-    # Various traversal attack patterns
-    traversal_urls = [
-        'https://example.com/de/../../../etc/passwd',
-        'https://example.com/de/../../sensitive.html',
-        'https://example.com/de/page/../../../etc/malicious',
-        'https://example.com/de/foo/bar/../../../sensitive',
-    ]
+def _assert_within(path, base_real):
+    """Assert path canonicalizes to somewhere inside base_real."""
+    assert os.path.commonpath([os.path.realpath(path), base_real]) == base_real
+
+
+@pytest.fixture(scope='module')
+def output_dir(tmp_path_factory):
+    """Output directory shared by the tests that only compute paths."""
+    return str(tmp_path_factory.mktemp('paths'))
+
 
-    for url in traversal_urls:
-        with pytest.raises(ValueError, match="Path traversal detected"):
-            map_paths(url, output_dir)
+TRAVERSAL_URLS = [
+    'https://example.com/de/../../../etc/passwd',
+    'https://example.com/de/../../sensitive.html',
+    'https://example.com/de/page/../../../etc/malicious',
+    'https://example.com/de/foo/bar/../../../sensitive',
+    'https://example.com/de/page/../admin.html',
+    'https://example.com/de/../config.html',
+    'https://example.com/de/section/../../../etc/passwd',
+]
 
+UNSAFE_URLS = [
+    'https://example.com/de/page;<script>alert(1)</script>',
+    'https://example.com/de/file%00.html',  # Null byte
+    'https://example.com/de/page|whoami',
+    'https://example.com/de/file&command',
+    'https://example.com/de/path\\windows\\system32',
+]
+
+
+@pytest.mark.parametrize('url', TRAVERSAL_URLS)
+def test_blocks_dot_dot_traversal(output_dir, url):
+    """Block ../ traversal attempts and any path with '..' components"""
+    with pytest.raises(ValueError, match=_M_TRAVERSAL):
+        map_paths(url, output_dir)
+
+
+@pytest.mark.parametrize('url', UNSAFE_URLS)
+def test_blocks_unsafe_characters(output_dir, url):
+    """Validate path contains only safe characters"""
+    with pytest.raises(ValueError, match=_M_UNSAFE):
+        map_paths(url, output_dir)
 
-def test_blocks_absolute_paths_in_urls(tmp_path):
+
+def test_blocks_absolute_paths_in_urls(output_dir):
     """Block absolute path references in URLs"""
-    output_dir = str(tmp_path)
 
     # Absolute paths should fail safe character validation
     # Note: After stripping leading '/', these become relative
@@ -33,9 +65,8 @@ def test_blocks_absolute_paths_in_urls(tmp_path):
         map_paths('https://example.com//etc/passwd', output_dir)
 
 
-def test_allows_valid_relative_paths(tmp_path):
+def test_allows_valid_relative_paths(output_dir):
     """Allow valid relative paths within output directory"""
-    output_dir = str(tmp_path)
 
     valid_urls = [
         'https://example.com/de/page.html',
@@ -54,9 +85,8 @@ def test_allows_valid_relative_paths(tmp_path):
         assert '/en/' in en_path
 
 
-def test_output_stays_within_output_directory(tmp_path):
+def test_output_stays_within_output_directory(output_dir):
     """Ensure all output paths stay within the output directory"""
-    output_dir = str(tmp_path)
 
     test_urls = [
         'https://example.com/de/page.html',
@@ -64,59 +94,24 @@ def test_output_stays_within_output_directory(tmp_path):
         'https://example.com/de/',
     ]
 
+    base_real = os.path.realpath(output_dir)
     for url in test_urls:
         de_path, en_path = map_paths(url, output_dir)
 
-        # Resolve paths and verify they're within output_dir
-        de_resolved = Path(de_path).resolve()
-        en_resolved = Path(en_path).resolve()
-        base_resolved = tmp_path.resolve()
-
-        assert str(de_resolved).startswith(str(base_resolved))
-        assert str(en_resolved).startswith(str(base_resolved))
-
-
-def test_blocks_dot_dot_in_path_components(tmp_path):
-    """Block any path containing '..' components"""
-    output_dir = str(tmp_path)
-
-    dotdot_urls = [
-        'https://example.com/de/page/../admin.html',
-        'https://example.com/de/../config.html',
-        'https://example.com/de/section/../../../etc/passwd',
-    ]
-
-    for url in dotdot_urls:
-        with pytest.raises(ValueError, match="Path traversal detected"):
-            map_paths(url, output_dir)
-
-
-def test_blocks_unsafe_characters(tmp_path):
-    """Validate path contains only safe characters"""
-    output_dir = str(tmp_path)
+        # Canonicalize paths and verify they're within output_dir
+        _assert_within(de_path, base_real)
+        _assert_within(en_path, base_real)
 
-    unsafe_urls = [
-        'https://example.com/de/page;<script>alert(1)</script>',
-        'https://example.com/de/file%00.html',  # Null byte
-        'https://example.com/de/page|whoami',
-        'https://example.com/de/file&command',
-        'https://example.com/de/path\\windows\\system32',
-    ]
 
-    for url in unsafe_urls:
-        with pytest.raises(ValueError, match="unsafe characters|Invalid path"):
-            map_paths(url, output_dir)
-
-
-def test_homepage_paths_are_safe(tmp_path):
+def test_homepage_paths_are_safe(output_dir):
     """Homepage URLs map safely to index.html"""
-    output_dir = str(tmp_path)
 
     homepage_urls = [
         'https://example.com/',
         'https://example.com/de/',
     ]
 
+    base_real = os.path.realpath(output_dir)
     for url in homepage_urls:
         de_path, en_path = map_paths(url, output_dir)
 
@@ -124,13 +119,12 @@ def test_homepage_paths_are_safe(tmp_path):
         assert en_path.endswith('en/index.html')
 
         # Verify within output directory
-        assert str(Path(de_path).resolve()).startswith(str(tmp_path.resolve()))
-        assert str(Path(en_path).resolve()).startswith(str(tmp_path.resolve()))
+        _assert_within(de_path, base_real)
+        _assert_within(en_path, base_real)
 
 
-def test_normal_nested_paths_work(tmp_path):
+def test_normal_nested_paths_work(output_dir):
     """Normal nested paths should work without issues"""
-    output_dir = str(tmp_path)
 
     de_path, en_path = map_paths(
         'https://example.com/de/products/category/item-123.html',
@@ -142,12 +136,11 @@ def test_normal_nested_paths_work(tmp_path):
     assert en_path.endswith('en/products/category/item-123.html')
 
     # Verify safety
-    assert str(Path(de_path).resolve()).startswith(str(tmp_path.resolve()))
+    _assert_within(de_path, os.path.realpath(output_dir))
 
 
-def test_edge_case_multiple_dots_in_filename(tmp_path):
+def test_edge_case_multiple_dots_in_filename(output_dir):
     """Filenames with multiple dots (but not ..) should work"""
-    output_dir = str(tmp_path)
 
     # This should work - dots in filename are OK, just not '..' component
     de_path, en_path = map_paths(
@@ -156,7 +149,7 @@ def test_edge_case_multiple_dots_in_filename(tmp_path):
     )
 
     assert 'file.backup.html' in de_path
-    assert str(Path(de_path).resolve()).startswith(str(tmp_path.resolve()))
+    _assert_within(de_path, os.path.realpath(output_dir))
 
 
 def test_symlink_escape_attempt(tmp_path):
@@ -172,9 +165,37 @@ def test_symlink_escape_attempt(tmp_path):
         # We're testing that our validation catches the '..' pattern
         # before any file operations occur
 
-        with pytest.raises(ValueError, match="Path traversal detected"):
+        with pytest.raises(ValueError, match=_M_TRAVERSAL):
             map_paths('https://example.com/de/../../external_sensitive/data.html', output_dir)
     finally:
         # Cleanup
         if external_dir.exists():
             external_dir.rmdir()
+
+
+def test_trusted_output_keeps_string_checks(output_dir):
+    """trusted_output skips realpath but still rejects '..' and unsafe characters"""
+
+    de_path, _ = map_paths('https://example.com/de/a/b.html', output_dir, trusted_output=True)
+    assert de_path.endswith('de/a/b.html')
+
+    with pytest.raises(ValueError, match=_M_TRAVERSAL):
+        map_paths('https://example.com/de/../etc/passwd', output_dir, trusted_output=True)
+
+    with pytest.raises(ValueError, match=_M_TRAVERSAL):
+        map_paths('https://example.com//etc/passwd', output_dir, trusted_output=True)
+
+    with pytest.raises(ValueError, match=_M_UNSAFE):
+        map_paths('https://example.com/de/page|whoami', output_dir, trusted_output=True)
+
+
+def test_output_tree_has_symlinks(tmp_path):
+    """Symlink scan flags links anywhere below the output directory"""
+    assert output_tree_has_symlinks(str(tmp_path / 'missing')) is False
+
+    nested = tmp_path / 'out' / 'de'
+    nested.mkdir(parents=True)
+    assert output_tree_has_symlinks(str(tmp_path / 'out')) is False
+
+    (nested / 'escape').symlink_to(tmp_path.parent)
+    assert output_tree_has_symlinks(str(tmp_path / 'out')) is True
@@ -2,11 +2,16 @@ from pathlib import Path
 import json
 import zipfile
 
+import pytest
+
 from src.static_site import StaticSiteConfig, build_site
 
 
-def test_build_site_generates_static_viewer(tmp_path):
-    output_dir = tmp_path / "output"
+@pytest.fixture(scope="module")
+def built_site(tmp_path_factory):
+    """Build the static site once; tests only read the generated tree."""
+    root = tmp_path_factory.mktemp("site")
+    output_dir = root / "output"
     output_dir.mkdir()
     de_dir = output_dir / "de_NEW"
     en_dir = output_dir / "en_NEW"
@@ -16,34 +21,45 @@ def test_build_site_generates_static_viewer(tmp_path):
     (de_dir / "index.html").write_text("<p>DE</p>", encoding="utf-8")
     (en_dir / "index.html").write_text("<p>EN</p>", encoding="utf-8")
 
-    site_dir = tmp_path / "docs"
+    site_dir = root / "docs"
     config = StaticSiteConfig(
         output_dir=output_dir,
         site_dir=site_dir,
         source_dir=de_dir,
         target_dir=en_dir,
+        compression=zipfile.ZIP_STORED,
     )
 
     build_site(config)
+    return site_dir
+
 
-    assert (site_dir / "index.html").exists()
-    assert (site_dir / "de" / "index.html").exists()
-    assert (site_dir / "en" / "index.html").exists()
+def test_build_site_generates_static_viewer(built_site: Path):
+    assert (built_site / "index.html").exists()
+    assert (built_site / "de" / "index.html").exists()
+    assert (built_site / "en" / "index.html").exists()
 
-    tree_path = site_dir / "data" / "tree.json"
-    meta_path = site_dir / "data" / "meta.json"
+
+def test_build_site_writes_tree_json(built_site: Path):
+    tree_path = built_site / "data" / "tree.json"
     assert tree_path.exists()
-    assert meta_path.exists()
 
     tree = json.loads(tree_path.read_text(encoding="utf-8"))
     assert tree["name"] == "de_NEW"
     assert tree["children"][0]["name"] == "index.html"
 
+
+def test_build_site_writes_meta_json(built_site: Path):
+    meta_path = built_site / "data" / "meta.json"
+    assert meta_path.exists()
+
     meta = json.loads(meta_path.read_text(encoding="utf-8"))
     assert {pkg["language"] for pkg in meta["packages"]} == {"de", "en"}
 
-    for lang in ("de", "en"):
-        archive = site_dir / "packages" / f"{lang}.zip"
-        assert archive.exists()
-        with zipfile.ZipFile(archive) as zip_file:
-            assert any(name.endswith("index.html") for name in zip_file.namelist())
+
+@pytest.mark.parametrize("lang", ["de", "en"])
+def test_build_site_packages_language_archives(built_site: Path, lang: str):
+    archive = built_site / "packages" / f"{lang}.zip"
+    assert archive.exists()
+    with zipfile.ZipFile(archive) as zip_file:
+        assert any(name.endswith("index.html") for name in zip_file.namelist())
@@ -1,9 +1,13 @@
 """Unit tests for translator helpers and batching/caching behaviour."""
 
+import sys
+import threading
+from types import SimpleNamespace
+
 import pytest
 
 from src import translator
-from src.hf_client import AuthenticationError
+from src.hf_client import AuthenticationError, RateLimitError
 from src.translator import (
     _normalize_text,
     _is_punctuation_only,
@@ -14,20 +18,57 @@ from src.translator import (
 
 
 @pytest.fixture(autouse=True)
-def reset_translator_cache():
-    """Ensure translator cache is reset between tests."""
-    translator._cache = None
-    translator._ARGOS_TRANSLATORS.clear()
-    yield
-    translator._cache = None
-    translator._ARGOS_TRANSLATORS.clear()
-
+def isolated_translator(monkeypatch):
+    """Give each test a fresh, cache-less translation context on the HF backend.
 
-@pytest.fixture(autouse=True)
-def force_hf_backend(monkeypatch):
-    """Default all tests to the HF backend unless overridden explicitly."""
+    The default context is created lazily, so tests that enable the cache or
+    switch backends only need to patch the module settings. monkeypatch
+    restores the previous state on teardown.
+    """
     monkeypatch.setenv('TRANSLATOR_BACKEND', 'hf')
+    monkeypatch.setattr(translator, 'CACHE_ENABLED', False)
+    monkeypatch.setattr(translator, '_default_context', None)
     yield
+    context = translator._default_context
+    if context is not None and context.cache is not None:
+        context.cache.close()
+
+
+class _FakeHfClient:
+    """Minimal HfClient stand-in shared by the batch and has_model tests.
+
+    ``respond`` maps a batch of texts to translations (or raises); calls
+    are recorded for assertions.
+    """
+
+    __slots__ = ('calls', 'health_checks', 'respond')
+
+    def __init__(self):
+        self.calls = []
+        self.health_checks = []
+        self.respond = lambda texts: [f"{text}-en" for text in texts]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def translate_texts(self, texts, src, dst):
+        self.calls.append(list(texts))
+        return self.respond(texts)
+
+    def health_check(self, src, dst):
+        self.health_checks.append((src, dst))
+        return True
+
+
+@pytest.fixture
+def hf_client(monkeypatch):
+    """Install a _FakeHfClient as translator.HfClient and return it."""
+    client = _FakeHfClient()
+    monkeypatch.setattr(translator, 'HfClient', lambda *args, **kwargs: client)
+    return client
 
 
 class TestNormalizeText:
@@ -114,26 +155,12 @@ class TestLooksEnglish:
 class TestTranslateBatch:
     """Tests covering batching, caching, and error handling."""
 
-    def test_translate_batch_groups_texts_and_preserves_order(self, monkeypatch, tmp_path):
+    def test_translate_batch_groups_texts_and_preserves_order(self, monkeypatch, tmp_path, hf_client):
         monkeypatch.setattr(translator, 'CACHE_ENABLED', True)
         monkeypatch.setattr(translator, 'CACHE_PATH', str(tmp_path / 'cache.db'))
         monkeypatch.setattr(translator, 'BATCH_SIZE', 3)
         monkeypatch.setattr(translator, 'MAX_TOKENS_PER_BATCH', 3)
-        calls = []
-
-        class FakeClient:
-            def __enter__(self):
-                return self
-
-            def __exit__(self, exc_type, exc, tb):
-                return False
-
-            def translate_texts(self, texts, src, dst):
-                calls.append(list(texts))
-                return [f"{text}-en" for text in texts]
-
-        monkeypatch.setattr(translator, 'has_model', lambda s, d: True)
-        monkeypatch.setattr(translator, 'HfClient', lambda *a, **k: FakeClient())
+        monkeypatch.setattr(translator, 'has_model', lambda *args, **kwargs: True)
 
         texts = [
             "\u00ADHallo",   # Contains soft hyphen → normalization
@@ -155,35 +182,69 @@ class TestTranslateBatch:
             "Freunde-en"
         ]
         # Two calls expected: first contains "Hallo" and "Welt", second "Freunde"
-        assert len(calls) == 2
-        assert calls[0] == ["Hallo", "Welt"]
-        assert calls[1] == ["Freunde"]
+        assert hf_client.calls == [["Hallo", "Welt"], ["Freunde"]]
 
-    def test_translate_batch_updates_and_reads_cache(self, monkeypatch, tmp_path):
-        cache_path = str(tmp_path / 'translations.db')
-        monkeypatch.setattr(translator, 'CACHE_ENABLED', True)
-        monkeypatch.setattr(translator, 'CACHE_PATH', cache_path)
-        monkeypatch.setattr(translator, 'BATCH_SIZE', 3)
-        monkeypatch.setattr(translator, 'MAX_TOKENS_PER_BATCH', 6)
+    def test_translate_batch_halves_batches_when_rate_limited(self, monkeypatch, hf_client):
+        monkeypatch.setattr(translator, 'BATCH_SIZE', 4)
+        monkeypatch.setattr(translator, 'MAX_TOKENS_PER_BATCH', 0)
+        sleeps = []
+        monkeypatch.setattr(translator.time, 'sleep', sleeps.append)
+        monkeypatch.setattr(translator, 'has_model', lambda s, d, **k: True)
 
-        class FakeClient:
-            def __init__(self):
-                self.calls = 0
+        def respond(texts):
+            if len(texts) > 2:
+                raise RateLimitError("Rate limit exceeded")
+            return [f"{text}-en" for text in texts]
 
-            def __enter__(self):
-                return self
+        hf_client.respond = respond
 
-            def __exit__(self, exc_type, exc, tb):
-                return False
+        texts = ["Eins", "Zwei", "Drei", "Vier", "Fünf"]
+
+        result = translate_batch(texts, src='de', dst='en')
+
+        assert result == [f"{text}-en" for text in texts]
+        assert hf_client.calls == [
+            ["Eins", "Zwei", "Drei", "Vier"],
+            ["Eins", "Zwei"],
+            ["Drei", "Vier"],
+            ["Fünf"],
+        ]
+        assert len(sleeps) == 1
+
+    def test_translate_batch_backoff_grows_on_consecutive_rate_limits(self, monkeypatch, hf_client):
+        monkeypatch.setattr(translator, 'BATCH_SIZE', 8)
+        monkeypatch.setattr(translator, 'MAX_TOKENS_PER_BATCH', 0)
+        monkeypatch.setattr(translator, 'RATE_LIMIT_BACKOFF', 2.0)
+        monkeypatch.setattr(translator, 'RATE_LIMIT_MAX_BACKOFF', 30.0)
+        sleeps = []
+        monkeypatch.setattr(translator.time, 'sleep', sleeps.append)
+        monkeypatch.setattr(translator, 'has_model', lambda s, d, **k: True)
 
-            def translate_texts(self, texts, src, dst):
-                self.calls += 1
-                return [f"{text}-en" for text in texts]
+        # Calls 0 and 1 are consecutive 429s; call 3 follows a success
+        rate_limited_calls = {0, 1, 3}
 
-        fake_client = FakeClient()
+        def respond(texts):
+            if len(hf_client.calls) - 1 in rate_limited_calls:
+                raise RateLimitError("Rate limit exceeded")
+            return [f"{text}-en" for text in texts]
 
-        monkeypatch.setattr(translator, 'has_model', lambda s, d: True)
-        monkeypatch.setattr(translator, 'HfClient', lambda *a, **k: fake_client)
+        hf_client.respond = respond
+
+        texts = [f"Text {i}" for i in range(8)]
+
+        result = translate_batch(texts, src='de', dst='en')
+
+        assert result == [f"{text}-en" for text in texts]
+        assert [len(call) for call in hf_client.calls[:5]] == [8, 4, 2, 2, 1]
+        assert sleeps == [2.0, 4.0, 2.0]
+
+    def test_translate_batch_updates_and_reads_cache(self, monkeypatch, tmp_path, hf_client):
+        cache_path = str(tmp_path / 'translations.db')
+        monkeypatch.setattr(translator, 'CACHE_ENABLED', True)
+        monkeypatch.setattr(translator, 'CACHE_PATH', cache_path)
+        monkeypatch.setattr(translator, 'BATCH_SIZE', 3)
+        monkeypatch.setattr(translator, 'MAX_TOKENS_PER_BATCH', 6)
+        monkeypatch.setattr(translator, 'has_model', lambda *args, **kwargs: True)
 
         inputs = ["Freund", "Freund"]
 
@@ -192,32 +253,33 @@ class TestTranslateBatch:
 
         assert first == ["Freund-en", "Freund-en"]
         assert second == first
-        assert fake_client.calls == 1, "Cache should avoid the second API call"
+        assert len(hf_client.calls) == 1, "Cache should avoid the second API call"
 
-    def test_translate_batch_handles_short_responses(self, monkeypatch, tmp_path):
+    def test_translate_batch_handles_short_responses(self, monkeypatch, tmp_path, hf_client):
         monkeypatch.setattr(translator, 'CACHE_ENABLED', True)
         monkeypatch.setattr(translator, 'CACHE_PATH', str(tmp_path / 'cache.db'))
         monkeypatch.setattr(translator, 'BATCH_SIZE', 3)
         monkeypatch.setattr(translator, 'MAX_TOKENS_PER_BATCH', 6)
-        class FakeClient:
-            def __enter__(self):
-                return self
-
-            def __exit__(self, exc_type, exc, tb):
-                return False
-
-            def translate_texts(self, texts, src, dst):
-                # Return fewer translations than requested to trigger fallback
-                return [f"{texts[0]}-en"]
-
-        monkeypatch.setattr(translator, 'has_model', lambda s, d: True)
-        monkeypatch.setattr(translator, 'HfClient', lambda *a, **k: FakeClient())
+        monkeypatch.setattr(translator, 'has_model', lambda *args, **kwargs: True)
+        # Return fewer translations than requested to trigger fallback
+        hf_client.respond = lambda texts: [f"{texts[0]}-en"]
 
         texts = ["Hallo", "Welt"]
         result = translate_batch(texts, src='de', dst='en')
 
         assert result == ["Hallo-en", "Welt"], "Short response should fall back to original"
 
+    def test_translate_batch_all_skipped_leaves_context_untouched(self, monkeypatch):
+        monkeypatch.setattr(translator, 'CACHE_ENABLED', True)
+
+        def _should_not_call(*args, **kwargs):  # pragma: no cover - guard path
+            raise AssertionError("all-skip batch should not open a context")
+
+        monkeypatch.setattr(translator, '_get_default_context', _should_not_call)
+
+        texts = ["", "   ", "•", "|", "The header"]
+        assert translate_batch(texts, src='de', dst='en') == texts
+
     def test_translate_batch_dry_run_skips_backend(self, monkeypatch):
         def _should_not_call(*args, **kwargs):  # pragma: no cover - guard path
             raise AssertionError("should not call has_model")
@@ -249,7 +311,7 @@ class TestTranslateBatch:
 
         fake_translator = FakeArgosTranslator()
         monkeypatch.setenv('TRANSLATOR_BACKEND', 'argos')
-        monkeypatch.setattr(translator, '_load_argos_translator', lambda s, d: fake_translator)
+        monkeypatch.setattr(translator, '_load_argos_translator', lambda *args, **kwargs: fake_translator)
 
         texts = ["Hallo", "Welt"]
         result = translate_batch(texts, src='de', dst='en')
@@ -270,37 +332,56 @@ class TestHasModel:
         monkeypatch.setattr(translator, 'HfClient', _raise_auth)
         assert has_model('de', 'en') is False
 
-    def test_has_model_uses_health_check(self, monkeypatch):
+    def test_has_model_uses_health_check(self, monkeypatch, hf_client):
         monkeypatch.setenv('TRANSLATOR_BACKEND', 'hf')
 
-        class FakeClient:
-            def __init__(self, *args, **kwargs):
-                self.used = False
-
-            def __enter__(self):
-                return self
-
-            def __exit__(self, exc_type, exc, tb):
-                return False
-
-            def health_check(self, src, dst):
-                self.used = True
-                return True
-
-        fake_client = FakeClient()
-        monkeypatch.setattr(translator, 'HfClient', lambda *a, **k: fake_client)
-
         assert has_model('de', 'en') is True
-        assert fake_client.used is True
+        assert hf_client.health_checks == [('de', 'en')]
 
     def test_has_model_argos_true_when_translator_available(self, monkeypatch):
         monkeypatch.setenv('TRANSLATOR_BACKEND', 'argos')
-        monkeypatch.setattr(translator, '_load_argos_translator', lambda s, d: object())
+        monkeypatch.setattr(translator, '_load_argos_translator', lambda *args, **kwargs: object())
 
         assert has_model('de', 'en') is True
 
     def test_has_model_argos_false_when_translator_missing(self, monkeypatch):
         monkeypatch.setenv('TRANSLATOR_BACKEND', 'argos')
-        monkeypatch.setattr(translator, '_load_argos_translator', lambda s, d: None)
+        monkeypatch.setattr(translator, '_load_argos_translator', lambda *args, **kwargs: None)
 
         assert has_model('de', 'en') is False
+
+
+class TestLoadArgosTranslator:
+    """Argos language enumeration is cached per context."""
+
+    def test_scans_installed_languages_once_across_threads(self, monkeypatch):
+        fake_translation = SimpleNamespace(from_code='de', to_code='en')
+        languages = [
+            SimpleNamespace(code='de', translations_from=[fake_translation]),
+            SimpleNamespace(code='en', translations_from=[]),
+        ]
+        scans = []
+
+        def load_installed_languages():
+            scans.append(1)
+            return languages
+
+        fake_translate = SimpleNamespace(load_installed_languages=load_installed_languages)
+        monkeypatch.setitem(sys.modules, 'argostranslate', SimpleNamespace(translate=fake_translate))
+        monkeypatch.setitem(sys.modules, 'argostranslate.translate', fake_translate)
+
+        context = translator.TranslationContext()
+        results = []
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(translator._load_argos_translator('de', 'en', context))
+            )
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert results == [fake_translation] * 8
+        assert len(scans) == 1
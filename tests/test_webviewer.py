@@ -1,6 +1,8 @@
 import errno
+from http.server import ThreadingHTTPServer
 from pathlib import Path
-from zipfile import ZipFile
+from unittest.mock import DEFAULT, create_autospec
+from zipfile import ZIP_STORED, ZipFile
 
 import pytest
 
@@ -15,6 +17,26 @@ from src.webviewer import (
 )
 
 
+@pytest.fixture(scope="module")
+def viewer_state(tmp_path_factory):
+    """Read-only de/en tree shared by tests that never write into it.
+
+    ``page.html`` exists on both sides; ``source_only.html`` has no
+    translation. Tests that write (e.g. packages) use their own tmp_path.
+    """
+    root = tmp_path_factory.mktemp("viewer")
+    source_dir = root / "de_NEW"
+    target_dir = root / "en_NEW"
+    source_dir.mkdir()
+    target_dir.mkdir()
+
+    (source_dir / "page.html").write_text("<p>DE</p>", encoding="utf-8")
+    (target_dir / "page.html").write_text("<p>EN</p>", encoding="utf-8")
+    (source_dir / "source_only.html").write_text("content", encoding="utf-8")
+
+    return ViewerState(source_dir=source_dir, target_dir=target_dir)
+
+
 def test_build_file_tree_orders_directories_before_files(tmp_path):
     root = tmp_path / "root"
     root.mkdir()
@@ -32,39 +54,26 @@ def test_build_file_tree_orders_directories_before_files(tmp_path):
     assert tree[0]["children"][0]["path"] == "a_dir/inner.html"
 
 
-def test_safe_relative_path_rejects_traversal():
+@pytest.mark.parametrize("raw_path", ["../etc/passwd", "a/../b", "/abs", "..\\win", "a/.."])
+def test_safe_relative_path_rejects_traversal(raw_path):
     with pytest.raises(ValueError):
-        _safe_relative_path("../etc/passwd")
+        _safe_relative_path(raw_path)
 
 
-def test_load_document_reads_html(tmp_path):
-    source_dir = tmp_path / "de"
-    target_dir = tmp_path / "en"
-    source_dir.mkdir()
-    target_dir.mkdir()
+def test_safe_relative_path_accepts_nested_files():
+    assert _safe_relative_path("a/b..c/page.html") == Path("a/b..c/page.html")
 
-    (source_dir / "page.html").write_text("<p>DE</p>", encoding="utf-8")
-    (target_dir / "page.html").write_text("<p>EN</p>", encoding="utf-8")
 
-    state = ViewerState(source_dir=source_dir, target_dir=target_dir)
-    result = load_document(state, Path("page.html"))
+def test_load_document_reads_html(viewer_state):
+    result = load_document(viewer_state, Path("page.html"))
 
     assert result["source"]["html"] == "<p>DE</p>"
     assert result["target"]["html"] == "<p>EN</p>"
 
 
-def test_load_document_missing_target(tmp_path):
-    source_dir = tmp_path / "de"
-    target_dir = tmp_path / "en"
-    source_dir.mkdir()
-    target_dir.mkdir()
-
-    (source_dir / "page.html").write_text("content", encoding="utf-8")
-
-    state = ViewerState(source_dir=source_dir, target_dir=target_dir)
-
+def test_load_document_missing_target(viewer_state):
     with pytest.raises(FileNotFoundError):
-        load_document(state, Path("page.html"))
+        load_document(viewer_state, Path("source_only.html"))
 
 
 def test_resolve_language_dir_prefers_new(tmp_path):
@@ -81,63 +90,36 @@ def test_resolve_language_dir_falls_back(tmp_path):
     assert resolved.name == "de"
 
 
-def test_create_http_server_retries_on_busy_port(tmp_path, monkeypatch):
-    source_dir = tmp_path / "de"
-    target_dir = tmp_path / "en"
-    source_dir.mkdir()
-    target_dir.mkdir()
-    state = ViewerState(source_dir=source_dir, target_dir=target_dir)
-
-    calls = []
+def test_create_http_server_retries_on_busy_port(viewer_state, monkeypatch):
+    server_cls = create_autospec(ThreadingHTTPServer)
+    server_cls.side_effect = [OSError(errno.EADDRINUSE, "busy"), DEFAULT]
+    monkeypatch.setattr("src.webviewer.ThreadingHTTPServer", server_cls)
 
-    class DummyServer:
-        def __init__(self, address, handler):
-            calls.append(address)
-            if len(calls) == 1:
-                raise OSError(errno.EADDRINUSE, "busy")
-
-        def server_close(self):
-            pass
-
-    monkeypatch.setattr("src.webviewer.ThreadingHTTPServer", DummyServer)
-
-    httpd, bound_port = create_http_server("127.0.0.1", 8000, 2, state, [])
-    assert calls == [("127.0.0.1", 8000), ("127.0.0.1", 8001)]
+    httpd, bound_port = create_http_server("127.0.0.1", 8000, 2, viewer_state, [])
+    assert [c.args[0] for c in server_cls.call_args_list] == [
+        ("127.0.0.1", 8000),
+        ("127.0.0.1", 8001),
+    ]
     assert bound_port == 8001
-    assert getattr(httpd, "viewer_state") is state
+    assert httpd is server_cls.return_value
+    assert getattr(httpd, "viewer_state") is viewer_state
     assert getattr(httpd, "viewer_packages") == []
-    httpd.server_close()
-
 
-def test_create_http_server_raises_after_attempts(tmp_path, monkeypatch):
-    source_dir = tmp_path / "de"
-    target_dir = tmp_path / "en"
-    source_dir.mkdir()
-    target_dir.mkdir()
-    state = ViewerState(source_dir=source_dir, target_dir=target_dir)
-
-    class DummyServer:
-        def __init__(self, address, handler):
-            raise OSError(errno.EADDRINUSE, "busy")
 
-    monkeypatch.setattr("src.webviewer.ThreadingHTTPServer", DummyServer)
+def test_create_http_server_raises_after_attempts(viewer_state, monkeypatch):
+    server_cls = create_autospec(ThreadingHTTPServer)
+    server_cls.side_effect = OSError(errno.EADDRINUSE, "busy")
+    monkeypatch.setattr("src.webviewer.ThreadingHTTPServer", server_cls)
 
-    with pytest.raises(OSError):
-        create_http_server("127.0.0.1", 9000, 2, state, [])
+    with pytest.raises(OSError) as excinfo:
+        create_http_server("127.0.0.1", 9000, 3, viewer_state, [])
+    assert excinfo.value.errno == errno.EADDRINUSE
+    assert server_cls.call_count == 3
 
 
-def test_ensure_packages_creates_archives(tmp_path):
+def test_ensure_packages_creates_archives(viewer_state, tmp_path):
     root = tmp_path
-    source_dir = root / "de_NEW"
-    target_dir = root / "en_NEW"
-    source_dir.mkdir()
-    target_dir.mkdir()
-
-    (source_dir / "index.html").write_text("<p>DE</p>", encoding="utf-8")
-    (target_dir / "index.html").write_text("<p>EN</p>", encoding="utf-8")
-
-    state = ViewerState(source_dir=source_dir, target_dir=target_dir)
-    packages = ensure_packages(state, root)
+    packages = ensure_packages(viewer_state, root, compression=ZIP_STORED)
 
     assert (root / "packages").is_dir()
     assert {package.language for package in packages} == {"de", "en"}
@@ -146,5 +128,13 @@ def test_ensure_packages_creates_archives(tmp_path):
         assert package.archive_path.exists()
         assert package.directory.name in package.label
         with ZipFile(package.archive_path) as zf:
-            entries = zf.namelist()
-            assert any(name.startswith(f"{package.directory.name}/") for name in entries)
+            infos = zf.infolist()
+        roots = {info.filename.partition("/")[0] for info in infos}
+        assert roots == {package.directory.name}
+        files = {info.filename for info in infos if not info.is_dir()}
+        assert {info.compress_type for info in infos} == {ZIP_STORED}
+        expected = {
+            f"{package.directory.name}/{path.name}"
+            for path in package.directory.iterdir()
+        }
+        assert files == expected
@@ -1,8 +1,10 @@
 """Tests for writer module"""
+import copy
 import pytest
 import tempfile
 from pathlib import Path
 from bs4 import BeautifulSoup, NavigableString
+from lxml import html as lxml_html
 from src.parser import parse
 from src.writer import (
     apply_translations, rewrite_links,
@@ -33,9 +35,9 @@ def test_apply_translations_inplace():
     assert 'Translated text' in str(soup.p)
 
 
-def test_rewrite_links_de_to_en():
-    """Only /de/ links rewritten to /en/"""
-    html = """<html><body>
+REWRITE_CASES = [
+    pytest.param(
+        """<html><body>
     <a href="/de/page1">Link 1</a>
     <a href="/de/sub/page2">Link 2</a>
     <a href="/en/existing">Already EN</a>
@@ -43,47 +45,41 @@ def test_rewrite_links_de_to_en():
     <a href="tel:123">Phone</a>
     <a href="#anchor">Anchor</a>
     <a href="https://external.com">External</a>
-    </body></html>"""
-
-    soup = BeautifulSoup(html, 'lxml')
-    rewrite_links(soup, from_prefix='/de/', to_prefix='/en/')
-
-    links = soup.find_all('a')
-    hrefs = [a.get('href') for a in links]
-
-    assert '/en/page1' in hrefs
-    assert '/en/sub/page2' in hrefs
-    assert '/de/page1' not in hrefs
-    assert '/de/sub/page2' not in hrefs
-    # These should be unchanged
-    assert '/en/existing' in hrefs
-    assert 'mailto:test@example.com' in hrefs
-    assert 'tel:123' in hrefs
-    assert '#anchor' in hrefs
-    assert 'https://external.com' in hrefs
-
-
-def test_rewrite_absolute_same_domain_links():
-    """Absolute same-domain links also rewritten"""
-    html = """<html><body>
+    </body></html>""",
+        {},
+        # Rewritten, plus links that must stay unchanged
+        ['/en/page1', '/en/sub/page2', '/en/existing', 'mailto:test@example.com',
+         'tel:123', '#anchor', 'https://external.com'],
+        ['/de/page1', '/de/sub/page2'],
+        id='relative_de_to_en',
+    ),
+    pytest.param(
+        """<html><body>
     <a href="https://example.com/de/page1">Absolute DE</a>
     <a href="http://example.com/de/page2">HTTP Absolute</a>
     <a href="/de/relative">Relative DE</a>
     <a href="https://other.com/de/external">External domain</a>
-    </body></html>"""
-
+    </body></html>""",
+        {'domain': 'example.com'},
+        # Absolute same-domain links become relative /en/ paths; other domains untouched
+        ['/en/page1', '/en/page2', '/en/relative', 'https://other.com/de/external'],
+        ['https://example.com/de/page1', 'http://example.com/de/page2'],
+        id='absolute_same_domain',
+    ),
+]
+
+
+@pytest.mark.parametrize("html, kwargs, must_contain, must_not_contain", REWRITE_CASES)
+def test_rewrite_links(html, kwargs, must_contain, must_not_contain):
+    """Only /de/ links (relative or same-domain absolute) rewritten to /en/"""
     soup = BeautifulSoup(html, 'lxml')
-    rewrite_links(soup, from_prefix='/de/', to_prefix='/en/', domain='example.com')
+    rewrite_links(soup, from_prefix='/de/', to_prefix='/en/', **kwargs)
 
-    links = soup.find_all('a')
-    hrefs = [a.get('href') for a in links]
+    # Assert on the serialized output; XPath yields the href strings directly
+    hrefs = set(lxml_html.fromstring(str(soup)).xpath('//a/@href'))
 
-    # Absolute same-domain should be rewritten to relative /en/ path
-    assert '/en/page1' in hrefs
-    assert '/en/page2' in hrefs
-    assert '/en/relative' in hrefs
-    # External domain should be unchanged
-    assert 'https://other.com/de/external' in hrefs
+    assert hrefs.issuperset(must_contain)
+    assert hrefs.isdisjoint(must_not_contain)
 
 
 def test_set_html_lang_to_en():
@@ -96,27 +92,27 @@ def test_set_html_lang_to_en():
     assert soup.html.get('lang') == 'en'
 
 
-def test_map_paths_and_write_utf8(tmp_path):
-    """URL->path mapping and UTF-8 writing"""
-    output_dir = str(tmp_path)
+@pytest.mark.parametrize("url, expected_de, expected_en", [
+    ('https://example.com/de/section/', 'de/section/index.html', 'en/section/index.html'),
+    ('https://example.com/de/page.html', 'de/page.html', 'en/page.html'),
+    # Homepage (empty path and DE root) maps to index.html, not .html
+    ('https://example.com/', 'de/index.html', 'en/index.html'),
+    ('https://example.com/de/', 'de/index.html', 'en/index.html'),
+    # ';params' on the last segment are dropped, as urlparse does
+    ('https://example.com/de/page;jsessionid=abc', 'de/page.html', 'en/page.html'),
+])
+def test_map_paths(url, expected_de, expected_en):
+    """URL->path mapping mirrors the URL under de/ and en/"""
+    de_path, en_path = map_paths(url, 'output')
+
+    assert de_path.endswith(expected_de)
+    assert en_path.endswith(expected_en)
 
-    # Test trailing slash -> index.html
-    de_path, en_path = map_paths(
-        'https://example.com/de/section/',
-        output_dir
-    )
-    assert de_path.endswith('de/section/index.html')
-    assert en_path.endswith('en/section/index.html')
 
-    # Test .html file preservation
-    de_path, en_path = map_paths(
-        'https://example.com/de/page.html',
-        output_dir
-    )
-    assert de_path.endswith('de/page.html')
-    assert en_path.endswith('en/page.html')
+def test_save_html_writes_utf8(tmp_path):
+    """UTF-8 writing of a mapped output path"""
+    de_path, _ = map_paths('https://example.com/de/page.html', str(tmp_path))
 
-    # Test write
     soup = BeautifulSoup('<html><body>Ümläuts</body></html>', 'lxml')
     save_html(soup, de_path, encoding='utf-8')
 
@@ -125,21 +121,6 @@ def test_map_paths_and_write_utf8(tmp_path):
     assert 'Ümläuts' in content
 
 
-def test_map_paths_homepage():
-    """Homepage URL maps to index.html, not .html"""
-    output_dir = 'output'
-
-    # Test homepage (empty path)
-    de_path, en_path = map_paths('https://example.com/', output_dir)
-    assert de_path.endswith('de/index.html')
-    assert en_path.endswith('en/index.html')
-
-    # Test DE homepage
-    de_path, en_path = map_paths('https://example.com/de/', output_dir)
-    assert de_path.endswith('de/index.html')
-    assert en_path.endswith('en/index.html')
-
-
 def test_dom_shape_equal():
     """Helper: DOM shape unchanged after translation"""
     original_html = """<html><body>
@@ -148,15 +129,16 @@ def test_dom_shape_equal():
     </body></html>"""
 
     soup1 = BeautifulSoup(original_html, 'lxml')
-    soup2 = BeautifulSoup(original_html, 'lxml')
+    soup2 = copy.copy(soup1)  # Deep copy of the tree; no second parse
 
     # Apply some translation (doesn't matter what)
     for string in soup2.find_all(string=True):
         if string.strip():
             string.replace_with('TRANSLATED')
 
-    # Check tag structure is same
-    tags1 = [tag.name for tag in soup1.find_all()]
-    tags2 = [tag.name for tag in soup2.find_all()]
+    # Check tag structure is same; lxml walks the serialized tree in C
+    tags1 = [el.tag for el in lxml_html.fromstring(str(soup1)).iter() if isinstance(el.tag, str)]
+    tags2 = [el.tag for el in lxml_html.fromstring(str(soup2)).iter() if isinstance(el.tag, str)]
 
+    assert tags1 == ['html', 'body', 'h1', 'ul', 'li', 'li']
     assert tags1 == tags2